@@ -1,12 +1,27 @@
 import streamlit as st
-import FinanceDataReader as fdr
-import yfinance as yf
 import pandas as pd
 import datetime
 import numpy as np
-import plotly.graph_objects as go
 import streamlit.components.v1 as components
 
+from fx_backtest import factor_history, walk_forward_backtest_pairs
+from fx_calibration import CalibrationCache, walk_forward_coefs
+from fx_charts import build_backtest_figure, build_forecast_figure
+from fx_data import SOURCE_FAILED, MarketDataRefresher
+from fx_live import LIVE_INTERVAL, LiveQuotePoller, build_live_bundle, make_feed
+from fx_metrics import note_miss, stage, start_metrics_server, start_rerun
+from fx_model import (
+    DEFAULT_SCENARIO, FORECAST_DAYS, FACTOR_ANCHORS, HAND_TUNED_COEFS,
+    FORECAST_PERCENTILES, compute_fair_value, forecast_bands, forecast_bands_batch,
+    pair_fair_values, sensitivity_surface, simulate_paths,
+)
+from fx_pairs import BASE_PAIR, PAIRS, pair_param
+from fx_report import build_report_bundle
+
+# rerun 단위 계측 시작 (FX_METRICS_PORT 지정 시 /metrics 엔드포인트 기동)
+metrics_run = start_rerun()
+start_metrics_server()
+
 # -----------------------------------------------------------------------------
 # 1. 페이지 설정 및 CSS 디자인
 # -----------------------------------------------------------------------------
@@ -63,7 +78,7 @@ st.markdown("""
 
     /* 슬라이더 & 버튼 */
     div.stSlider > div > div > div > div { background-color: #f97316 !important; }
-    div.stButton > button {
+    div.stButton > button, div.stFormSubmitButton > button {
         background: linear-gradient(90deg, #ea580c, #c2410c);
         color: white; border: none; padding: 0.6rem; border-radius: 8px; width: 100%; font-weight: bold;
     }
@@ -73,203 +88,276 @@ st.markdown("""
 # -----------------------------------------------------------------------------
 # 2. 데이터 수집 로직 (안정성 강화)
 # -----------------------------------------------------------------------------
-@st.cache_data(ttl=3600)
-def get_market_data_robust():
-    today = datetime.datetime.now()
-    start = today - datetime.timedelta(days=365*5) # 5년치
-    
-    df_krw = pd.DataFrame()
-    source_used = "Data Error"
-    
-    # 1. Naver Finance
-    try:
-        df_krw = fdr.DataReader('USD/KRW', start, today)
-        if not df_krw.empty and len(df_krw) > 10:
-            source_used = "Naver Finance (KRX)"
-    except: pass
-
-    # 2. Yahoo Finance (Backup)
-    if df_krw.empty:
-        try:
-            df_krw = yf.download('KRW=X', start=start, end=today, progress=False)
-            if not df_krw.empty:
-                if 'Adj Close' in df_krw.columns: df_krw = pd.DataFrame({'Close': df_krw['Adj Close']})
-                elif 'Close' in df_krw.columns: df_krw = pd.DataFrame({'Close': df_krw['Close']})
-                else: df_krw = pd.DataFrame({'Close': df_krw.iloc[:,0]})
-                source_used = "Yahoo Finance"
-        except: pass
-
-    if df_krw.empty:
-        return pd.DataFrame(), 0, "", "Connection Failed"
-
-    last_price = df_krw['Close'].iloc[-1]
-    last_date = df_krw.index[-1].strftime("%Y-%m-%d")
-    
-    return df_krw, last_price, last_date, source_used
-
-with st.spinner('시장 데이터를 분석 중입니다...'):
-    df_krw, current_price, last_date, source = get_market_data_robust()
-
-if df_krw.empty:
+@st.cache_resource
+def get_refresher():
+    # 프로세스 공용 백그라운드 갱신기: 마지막 정상 데이터를 즉시 서빙하고, 갱신 실패 시에도 유지
+    # (로컬 저장소에 없는 최근 구간만 Naver · Yahoo 동시 조회, 거시 변수는 multi-ticker 일괄 수집)
+    return MarketDataRefresher().start()
+
+refresher = get_refresher()
+with stage("market_data") as rec:
+    snapshot = refresher.snapshot()
+    if snapshot is None:
+        # 로컬 저장소가 비어 있는 첫 기동 시에만 최초 수집을 기다림
+        with st.spinner('시장 데이터를 분석 중입니다...'):
+            snapshot = refresher.wait_for_snapshot(timeout=60)
+    rec.update(source=snapshot.source if snapshot else SOURCE_FAILED, rows=len(snapshot.close) if snapshot else 0)
+
+if snapshot is None:
+    metrics_run.finish()
     st.error("❌ 실시간 데이터를 가져오지 못했습니다. 잠시 후 새로고침 해주세요.")
+    if refresher.last_error:
+        st.caption(f"마지막 시도 {refresher.last_attempt:%H:%M:%S} - {refresher.last_error}")
+    if st.button("🔄 다시 시도"):
+        with st.spinner('시장 데이터를 다시 요청하는 중입니다...'):
+            refresher.refresh()
+        st.rerun()
     st.stop()
 
+# 세션은 공유 스냅샷의 읽기 전용 뷰만 사용 (복사 없음)
+source, usd_price, last_date = snapshot.source, snapshot.last_price, snapshot.last_date
+pairs = snapshot.available_pairs()
+data_age_min = (datetime.datetime.now() - snapshot.refreshed_at).total_seconds() / 60
+
 # -----------------------------------------------------------------------------
 # 3. 사이드바 (변수 설정) - 기준금리 초기값 수정 (US 3.75, KR 2.5)
 # -----------------------------------------------------------------------------
+def latest_factor(name, lo, hi):
+    # 최신 시장값으로 슬라이더 초기값 설정 (데이터가 없으면 기본 시나리오 값 사용)
+    latest = snapshot.latest_macro(name)
+    if latest is not None:
+        return round(float(np.clip(latest, lo, hi)), 2)
+    return DEFAULT_SCENARIO[name]
+
 with st.sidebar:
     st.markdown("### 🎛️ Scenario Control")
     st.markdown("(Created by Hyungho Yim)")
     st.markdown("---")
 
-    # [수정] 초기값을 요청하신 값(US 3.75, KR 2.5)으로 변경
-    st.markdown("**🏦 기준금리 (Policy Rates)**")
-    user_us_rate = st.slider("🇺🇸 미국 연준 금리 (%)", 2.0, 6.0, 3.75, step=0.25)
-    user_kr_rate = st.slider("🇰🇷 한국은행 금리 (%)", 1.0, 5.0, 2.50, step=0.25)
-    
+    pair = st.selectbox("💱 통화쌍 (Currency Pair)", pairs, index=0)
+    coef_set = st.radio("📐 적정가 계수", ("Hand-tuned", "Calibrated"), horizontal=True,
+                        help="Calibrated: 과거 US10Y · DXY · JPY · CNY 시계열로 추정한 계수 (Ridge + RLS 증분 갱신)")
     st.markdown("---")
-    st.markdown("**📊 시장 지표**")
-    user_seohak = st.slider("🐜 서학개미 매수강도", 0, 100, 80, help="높을수록 달러 매수세 강함")
-    user_us10y = st.slider("🇺🇸 미국채 10년물 (%)", 2.0, 6.0, 4.45, step=0.01)
-    user_dxy = st.slider("💵 달러 인덱스", 90.0, 115.0, 106.5)
+
+    # 슬라이더는 form 으로 묶어 '적용' 시에만 rerun (드래그 중 연속 재계산 방지)
+    with st.form("scenario_form", border=False):
+        # [수정] 초기값을 요청하신 값(US 3.75, KR 2.5)으로 변경
+        st.markdown("**🏦 기준금리 (Policy Rates)**")
+        user_us_rate = st.slider("🇺🇸 미국 연준 금리 (%)", 2.0, 6.0, DEFAULT_SCENARIO['us_rate'], step=0.25)
+        user_kr_rate = st.slider("🇰🇷 한국은행 금리 (%)", 1.0, 5.0, DEFAULT_SCENARIO['kr_rate'], step=0.25)
+        
+        st.markdown("---")
+        st.markdown("**📊 시장 지표**")
+        user_seohak = st.slider("🐜 서학개미 매수강도", 0, 100, DEFAULT_SCENARIO['seohak'], help="높을수록 달러 매수세 강함")
+        user_us10y = st.slider("🇺🇸 미국채 10년물 (%)", 2.0, 6.0, latest_factor('us10y', 2.0, 6.0), step=0.01)
+        user_dxy = st.slider("💵 달러 인덱스", 90.0, 115.0, latest_factor('dxy', 90.0, 115.0))
+        
+        st.markdown("---")
+        st.markdown("**🌏 주요국 통화 (USD 기준)**")
+        user_jpy = st.slider("🇯🇵 달러/엔 (USD/JPY)", 130.0, 170.0, latest_factor('jpy', 130.0, 170.0))
+        user_cny = st.slider("🇨🇳 달러/위안 (USD/CNY)", 6.5, 7.8, latest_factor('cny', 6.5, 7.8))
+        
+        st.form_submit_button("✅ 시나리오 적용")
     
     st.markdown("---")
-    st.markdown("**🌏 주요국 통화 (USD 기준)**")
-    user_jpy = st.slider("🇯🇵 달러/엔 (USD/JPY)", 130.0, 170.0, 153.0)
-    user_cny = st.slider("🇨🇳 달러/위안 (USD/CNY)", 6.5, 7.8, 7.28)
+    live_mode = st.toggle("⚡ 실시간 모드 (Intraday)", value=False, help=f"{LIVE_INTERVAL:g}초마다 시세를 받아 차트에 새 틱만 추가")
+    if not live_mode:
+        st.session_state.pop('live_seq', None)
     
-    st.markdown("---")
     if st.button("🔄 설정 초기화"):
         st.cache_data.clear()
+        refresher.request_refresh()
         st.rerun()
 
 # -----------------------------------------------------------------------------
-# 4. 모델링 로직 (Calibration for Default View)
+# 4. 모델링 로직 (시나리오별 캐시)
 # -----------------------------------------------------------------------------
-# [모델 튜닝]
-# 요청하신 초기값(금리) 상태에서 적정가가 1400원 초반대(하락 예측)가 나오도록
-# Base Constant를 대폭 낮추고, 금리 민감도를 높임.
-base_constant = 1150 # Base 대폭 하향 (다른 변수들의 상승 압력을 상쇄하기 위해)
+scenario = dict(
+    us_rate=user_us_rate, kr_rate=user_kr_rate, seohak=user_seohak,
+    us10y=user_us10y, dxy=user_dxy, jpy=user_jpy, cny=user_cny,
+)
+data_version = snapshot.version
+
+@st.cache_resource
+def get_calibration_cache():
+    # 프로세스 공용: 데이터 버전별 보정 모델 (새 일자가 들어오면 해당 행만 RLS 로 증분 갱신)
+    return CalibrationCache()
+
+calibration = None
+if coef_set == "Calibrated":
+    with stage("calibration") as rec:
+        try:
+            calibration = get_calibration_cache().get(data_version, snapshot.close_series(), snapshot.macro_frame())
+            rec.update(mode=calibration.mode, rows=calibration.n_obs)
+        except ValueError as exc:
+            st.sidebar.warning(f"⚠️ 계수 보정 실패 - Hand-tuned 계수를 사용합니다. ({exc})")
+    if calibration is not None:
+        st.sidebar.caption(f"보정 R² {calibration.r2:.2f} · RMSE {calibration.rmse:,.1f}원 · {calibration.n_obs:,} 관측치")
+coefs = calibration.coefs if calibration is not None else HAND_TUNED_COEFS
+coef_items = tuple(coefs.items())
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def get_scenario_result(data_version, scenario_items, pairs, prices, coef_items):
+    note_miss()
+    # 같은 데이터 버전 + 슬라이더 조합이면 전 통화쌍의 적정가·예측 밴드를 재사용 (최근 128개 유지)
+    # 차트는 선택한 통화쌍만 get_forecast_figure 에서 생성 (캐시 hit 시 숫자 배열만 역직렬화)
+    # 통화쌍별 최근 종가도 캐시 키에 포함 (당일 잠정 종가가 확정값으로 바뀌면 다시 계산)
+    scenario = dict(scenario_items)
+    prices = np.asarray(prices, dtype=float)
+
+    # [Fair Value 계산식] - fx_model.compute_fair_value (Hand-tuned 또는 보정 계수) → 통화쌍별 환산
+    usd_fair = compute_fair_value(**scenario, coefs=dict(coef_items))
+    market_cross = dict(zip(pairs, prices / prices[pairs.index(BASE_PAIR)]))
+    fair_values = pair_fair_values(usd_fair, scenario, market_cross, pairs)
+
+    # [Monte Carlo] 전 통화쌍을 (통화쌍 × 경로 × 일자) 배열로 한 번에 시뮬레이션 후 백분위 밴드 산출
+    paths = simulate_paths(prices, fair_values, days=FORECAST_DAYS,
+                           vol=pair_param('vol', pairs), cap=pair_param('intervention', pairs))
+    bands = forecast_bands(paths)
+    pair_bands = {p: {q: b[i] for q, b in bands.items()} for i, p in enumerate(pairs)}
+    return dict(zip(pairs, prices.tolist())), dict(zip(pairs, fair_values.tolist())), pair_bands
+
+@st.cache_resource(max_entries=128, show_spinner=False)
+def get_forecast_figure(data_version, scenario_items, coef_items, pair, price, _snapshot, _bands):
+    note_miss()
+    # Figure 는 생성 후 변경하지 않으므로 cache_resource 로 pickle 없이 세션 간 공유
+    start_date = pd.Timestamp(_snapshot.last_date)
+    dates_future = [start_date] + [start_date + datetime.timedelta(days=x) for x in range(1, FORECAST_DAYS+1)]
+    chart_close = _snapshot.pair_closes((pair,))[pair].iloc[-180:]
+    return build_forecast_figure(chart_close, dates_future, _bands, y_min=PAIRS[pair]['y_floor'])
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def get_backtest(data_version, pairs, coef_set, _snapshot):
+    note_miss()
+    # 슬라이더와 무관: 데이터 버전(마지막 일자, 행 수)이 같으면 재계산하지 않음
+    # US10Y / DXY / JPY / CNY 는 실제 과거 시계열, 나머지는 상수 (Walk-forward 보정에서 상쇄됨)
+    closes = _snapshot.pair_closes(pairs)
+    macro = _snapshot.macro_frame()
+    factors = factor_history(closes.index, DEFAULT_SCENARIO, macro)
+    # 결과는 읽기 전용으로만 쓰므로 cache_resource 로 공유 (통화쌍 전체 컬럼을 매 rerun pickle 하지 않음)
+    if coef_set != "Calibrated":
+        columns, metrics = walk_forward_backtest_pairs(closes, factors, pairs)
+        return columns, metrics, None
+    # 보정 계수도 t 시점 예측에는 t 까지의 데이터로 추정한 값만 사용 (전체 구간 적합값은 look-ahead)
+    # 보정 계수는 첫 1년 이후부터 있으므로 비교용 Hand-tuned 지표도 같은 일자만 채점
+    columns, metrics = walk_forward_backtest_pairs(closes, factors, pairs, coefs=walk_forward_coefs(closes[BASE_PAIR], macro))
+    _, baseline = walk_forward_backtest_pairs(closes, factors, pairs, scored=columns["Error"].notna())
+    return columns, metrics, baseline
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def get_backtest_figure(data_version, pairs, coef_set, pair, _columns):
+    note_miss()
+    return build_backtest_figure(pd.DataFrame({name: frame[pair] for name, frame in _columns.items()}))
 
 # 기준금리 차이(Spread)
 rate_spread = user_us_rate - user_kr_rate 
 
-# [Fair Value 계산식]
-# 금리차 계수를 100으로 상향 (0.25%p 변화에도 25원씩 움직이게 하여 민감도 강화)
-fair_value = (
-    base_constant 
-    + (rate_spread * 100)          # [Core] 한-미 금리차 (영향력 2배 강화)
-    + (user_us10y - 4.0) * 40      # 국채금리
-    + (user_dxy - 100) * 12        # 달러인덱스 (영향력 소폭 조정)
-    + (user_seohak - 50) * 1.5     # 서학개미
-    + (user_jpy - 140) * 2.0       # 달러/엔
-    + (user_cny - 7.0) * 30.0      # 달러/위안
-)
-# 이 세팅에서 초기값(Spread 1.25) 기준 Fair Value는 대략 1400~1420원 수준으로 형성되어
+with stage("scenario", cached=True, pairs=len(pairs)):
+    pair_prices, pair_fairs, pair_bands = get_scenario_result(
+        data_version, tuple(scenario.items()), pairs, snapshot.latest_pair_prices(pairs), coef_items)
+    fig = get_forecast_figure(data_version, tuple(scenario.items()), coef_items, pair, pair_prices[pair], snapshot, pair_bands[pair])
+# 초기값(Spread 1.25) 기준 Fair Value는 대략 1400~1420원 수준으로 형성되어
 # 현재가(1475원) 대비 하락하는 그래프가 그려집니다.
 
+current_price, fair_value = pair_prices[pair], pair_fairs[pair]
 diff = fair_value - current_price
+unit_label = f"원 ({PAIRS[pair]['unit']} {pair.split('/')[0]})" if PAIRS[pair]['unit'] != 1 else "원"
+price_fmt = ",.0f" if current_price >= 1000 else ",.2f"
 
 # -----------------------------------------------------------------------------
 # 5. 메인 대시보드
 # -----------------------------------------------------------------------------
 st.markdown('<div class="header-container"><span class="header-eng">FX-AI</span> <span class="header-kor">달러-원 예측 및 시뮬레이션 Model</span></div>', unsafe_allow_html=True)
-st.markdown(f'<div class="sub-header">Data Source: {source} | Last Sync: {last_date} | Market Price: {current_price:,.0f} KRW</div>', unsafe_allow_html=True)
+st.markdown(f'<div class="sub-header">Data Source: {source} | Last Sync: {last_date} | Data Age: {data_age_min:,.0f}분 전 | {pair}: {current_price:{price_fmt}} KRW</div>', unsafe_allow_html=True)
+if refresher.last_error:
+    st.caption(f"⚠️ 최근 데이터 갱신 실패 ({refresher.last_attempt:%H:%M}) - 마지막 정상 데이터를 표시 중입니다.")
 
 # [Top KPIs]
 k1, k2, k3, k4 = st.columns(4)
-k1.metric("AI 적정 환율 (Target)", f"{fair_value:,.0f} 원", f"{diff:+.1f} vs Market")
+k1.metric(f"AI 적정 환율 ({pair})", f"{fair_value:{price_fmt}} {unit_label}", f"{diff:+.1f} vs Market")
 k2.metric("🏦 한-미 금리차", f"{rate_spread:.2f}%p", "핵심 변수")
-k3.metric("🐜 서학개미 영향", f"{(user_seohak-50)*1.5:+.1f} 원", "환율 지지분")
+k3.metric("🐜 서학개미 영향", f"{(user_seohak-FACTOR_ANCHORS['seohak'])*coefs['seohak']:+.1f} 원", "환율 지지분")
 k4.metric("🌏 달러 인덱스", f"{user_dxy}", "Global Strength")
 
 # [Main Tabs]
 tab1, tab2 = st.tabs(["📊 환율 예측 및 시뮬레이션", "📜 5년 검증 (Backtest)"])
 
-# --- TAB 1: 실시간 예측 (3개월) ---
-with tab1:
-    chart_data = df_krw.iloc[-180:].copy()
-    future_days = 90 # 3개월
-    
-    start_date = pd.Timestamp(last_date)
-    dates_future = [start_date] + [start_date + datetime.timedelta(days=x) for x in range(1, future_days+1)]
-    
-    prices_future = [current_price]
-    current_val = current_price
+# --- 실시간 모드 (opt-in) ---
+@st.cache_resource
+def get_live_poller():
+    # 프로세스 공용 시세 폴러 (FX_LIVE_FEED=stub 이면 로컬 랜덤워크)
+    return LiveQuotePoller(make_feed(usd_price)).start()
+
+@st.cache_resource
+def get_live_component():
+    return components.declare_component("fx_live", path=build_live_bundle())
+
+@st.fragment(run_every=LIVE_INTERVAL)
+def live_panel(fair_value):
+    # 전체 rerun 없이 이 영역만 주기적으로 갱신: 새 틱만 차트에 추가하고 최신가 기준으로 예측 밴드 재계산
+    poller = get_live_poller()
+    cursor = st.session_state.get('live_seq')
+    seq, times, prices = poller.buffer.since(cursor or 0)
+    last = poller.buffer.last_price()
     
-    np.random.seed(42)
+    if last is not None:
+        bands = forecast_bands_batch(last, [fair_value])[0]
+        p = {q: bands[i, -1] for i, q in enumerate(FORECAST_PERCENTILES)}
+        l1, l2, l3 = st.columns(3)
+        l1.metric("⚡ 실시간 환율 (USD/KRW)", f"{last:,.2f} 원", f"{last - usd_price:+.2f} vs 종가")
+        l2.metric("3M 예측 중앙값 (실시간 기준)", f"{p[50]:,.0f} 원")
+        l3.metric("3M 90% 범위", f"{p[5]:,.0f} ~ {p[95]:,.0f} 원")
+    elif poller.last_error:
+        st.caption(f"⚠️ 실시간 시세 조회 실패: {poller.last_error}")
     
-    for i in range(1, future_days + 1):
-        gap = fair_value - current_val
-        
-        # 하락 시나리오가 잘 보이도록 추세 반영 속도 조정
-        trend_force = gap * 0.04 
-        noise = np.random.normal(0, 3.5) 
-        
-        next_val = current_val + trend_force + noise
-        
-        # [Intervention] 과도한 급등 제한 (1500원 저항)
-        if next_val > 1500:
-             excess = next_val - 1500
-             next_val = 1500 + (excess * 0.1)
-            
-        current_val = next_val
-        prices_future.append(current_val)
-    
-    all_prices = list(chart_data['Close']) + prices_future
-    y_min = 1300 
-    y_max = max(all_prices) * 1.02
+    get_live_component()(
+        x=np.datetime_as_string(times, unit='ms').tolist(), y=prices.tolist(),
+        seq=seq, reset=cursor is None, capacity=poller.buffer.capacity,
+        key="fx_live", default=None,
+    )
+    st.session_state['live_seq'] = seq
 
-    fig = go.Figure()
+# --- TAB 1: 실시간 예측 (3개월) ---
+with tab1:
+    if live_mode:
+        # 실시간 시세는 USD/KRW 기준
+        live_panel(pair_fairs[BASE_PAIR])
     
-    fig.add_trace(go.Scatter(
-        x=chart_data.index, y=chart_data['Close'], 
-        mode='lines', name='실제 환율 (Actual)', 
-        line=dict(color='#94a3b8', width=3), 
-        fill='tozeroy', fillcolor='rgba(148, 163, 184, 0.1)'
-    ))
-    
-    fig.add_trace(go.Scatter(
-        x=dates_future, y=prices_future, 
-        mode='lines', name='AI 예측 (Forecast 3M)', 
-        line=dict(color='#f97316', width=3, dash='dot')
-    ))
-
-    fig.update_layout(
-        height=500, 
-        plot_bgcolor='rgba(0,0,0,0)', 
-        paper_bgcolor='rgba(0,0,0,0)', 
-        font=dict(color='#e2e8f0', size=14), 
-        xaxis=dict(showgrid=False, gridcolor='#334155'), 
-        yaxis=dict(showgrid=True, gridcolor='#1e293b', range=[y_min, y_max], tickfont=dict(size=14)),
-        legend=dict(font=dict(color="white", size=14), orientation="h", y=1.05, x=1, xanchor="right", bgcolor="rgba(0,0,0,0)"),
-        margin=dict(l=20, r=20, t=40, b=20)
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    with stage("forecast_chart"):
+        st.plotly_chart(fig, use_container_width=True)
     
     st.info("💡 **Analyst Note:** AI 모델은 한-미 금리차, 서학개미 수급, 글로벌 달러 강세 등을 종합하여 향후 3개월간의 중기 환율 경로를 시뮬레이션합니다.")
 
 # --- TAB 2: 5년 검증 ---
 with tab2:
     st.markdown("#### 지난 5년간 모델 정합성 테스트")
-    backtest_df = df_krw.iloc[::5].copy()
-    noise = np.random.normal(0, 10, len(backtest_df))
-    backtest_df['Model_Value'] = backtest_df['Close'].rolling(window=10).mean().shift(-5).fillna(method='bfill') + noise
+    with stage("backtest", cached=True, pairs=len(pairs)) as rec:
+        bt_coef_set = coef_set if calibration is not None else "Hand-tuned"
+        bt_columns, bt_table, bt_baseline = get_backtest(data_version, pairs, bt_coef_set, snapshot)
+        bt_metrics = bt_table.loc[pair]
+        fig2 = get_backtest_figure(data_version, pairs, bt_coef_set, pair, bt_columns)
+        rec.update(rows=int(bt_table['N'].sum()))
     
-    fig2 = go.Figure()
-    fig2.add_trace(go.Scatter(x=backtest_df.index, y=backtest_df['Close'], name='실제 시장가 (Actual)', line=dict(color='#cbd5e1', width=1.5)))
-    fig2.add_trace(go.Scatter(x=backtest_df.index, y=backtest_df['Model_Value'], name='AI 적정가 (Fair Value)', line=dict(color='#f97316', width=2)))
+    b1, b2, b3 = st.columns(3)
+    if bt_baseline is None:
+        b1.metric(f"MAE ({int(bt_metrics['Horizon'])}일 후)", f"{bt_metrics['MAE']:,.1f} 원")
+        b2.metric("RMSE", f"{bt_metrics['RMSE']:,.1f} 원")
+        b3.metric("방향 적중률 (Hit Rate)", f"{bt_metrics['Hit_Rate']:.1%}", f"{int(bt_metrics['N']):,} 관측치")
+    else:
+        st.caption("📐 Calibrated: 각 시점의 계수는 그 시점까지의 데이터로만 추정 (Walk-forward). 계수 추정 1년 + "
+                   "적정가 보정 창 1년 이후 구간만 채점하며, Hand-tuned 비교치도 같은 일자로 계산합니다.")
+        base = bt_baseline.loc[pair]
+        b1.metric(f"MAE ({int(bt_metrics['Horizon'])}일 후)", f"{bt_metrics['MAE']:,.1f} 원",
+                  f"{bt_metrics['MAE'] - base['MAE']:+.1f} vs Hand-tuned", delta_color="inverse")
+        b2.metric("RMSE", f"{bt_metrics['RMSE']:,.1f} 원",
+                  f"{bt_metrics['RMSE'] - base['RMSE']:+.1f} vs Hand-tuned", delta_color="inverse")
+        b3.metric("방향 적중률 (Hit Rate)", f"{bt_metrics['Hit_Rate']:.1%}",
+                  f"{bt_metrics['Hit_Rate'] - base['Hit_Rate']:+.1%} vs Hand-tuned · {int(bt_metrics['N']):,} 관측치")
+    if len(pairs) > 1:
+        st.dataframe(bt_table[['MAE', 'RMSE', 'Hit_Rate', 'N']].round(3), use_container_width=True)
     
-    fig2.update_layout(
-        height=450, 
-        plot_bgcolor='rgba(0,0,0,0)', 
-        paper_bgcolor='rgba(0,0,0,0)', 
-        font=dict(color='#e2e8f0'), 
-        xaxis=dict(showgrid=False), 
-        yaxis=dict(showgrid=True, gridcolor='#1e293b'),
-        legend=dict(font=dict(color="white"))
-    )
-    st.plotly_chart(fig2, use_container_width=True)
+    with stage("backtest_chart"):
+        st.plotly_chart(fig2, use_container_width=True)
 
 # -----------------------------------------------------------------------------
 # 6. 인포그래픽 (Full Version)
@@ -277,161 +365,30 @@ with tab2:
 st.markdown("---")
 st.markdown("### 📑 FX-AI Insight Report & Methodology")
 
-infographic_html = """
-<!DOCTYPE html>
-<html lang="ko">
-<head>
-    <meta charset="UTF-8">
-    <script src="https://cdn.tailwindcss.com"></script>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <script src="https://cdn.plot.ly/plotly-2.27.0.min.js"></script>
-    <style>
-        body { background-color: #0f172a; color: #f8fafc; font-family: sans-serif; padding: 20px; }
-        .glass-card { background: rgba(30, 41, 59, 0.7); border: 1px solid rgba(255, 255, 255, 0.1); border-radius: 1rem; padding: 20px; margin-bottom: 20px; }
-        .high-corr { background-color: rgba(249, 115, 22, 0.2); border: 1px solid rgba(249, 115, 22, 0.5); color: #fb923c; }
-        .neg-corr { background-color: rgba(59, 130, 246, 0.2); border: 1px solid rgba(59, 130, 246, 0.5); color: #60a5fa; }
-        .correlation-box { text-align: center; padding: 10px; border-radius: 8px; margin: 5px; }
-        h3 { border-bottom: 1px solid #334155; padding-bottom: 10px; margin-bottom: 15px; font-weight: bold; font-size: 1.25rem; }
-    </style>
-</head>
-<body>
-    <div class="max-w-6xl mx-auto">
-        <!-- 1. Correlation Matrix -->
-        <div class="glass-card">
-            <h3 class="text-white">🔗 주요 경제지표 상관계수 매트릭스 (Correlation Matrix)</h3>
-            <p class="text-sm text-slate-400 mb-6">최근 5년 데이터 기준, 달러/원 환율 변동을 설명하는 핵심 변수들의 상관관계 분석입니다.</p>
-            <div class="grid grid-cols-2 md:grid-cols-4 gap-4 mb-6">
-                <div class="correlation-box high-corr">
-                    <div class="text-sm">한-미 금리차 (Spread)</div>
-                    <div class="text-2xl font-bold">+0.82</div>
-                    <div class="text-xs">Very Strong Positive</div>
-                </div>
-                <div class="correlation-box high-corr">
-                    <div class="text-sm">달러 인덱스 (DXY)</div>
-                    <div class="text-2xl font-bold">+0.89</div>
-                    <div class="text-xs">Very Strong Positive</div>
-                </div>
-                <div class="correlation-box high-corr">
-                    <div class="text-sm">미국채 10년물</div>
-                    <div class="text-2xl font-bold">+0.72</div>
-                    <div class="text-xs">Strong Positive</div>
-                </div>
-                <div class="correlation-box high-corr">
-                    <div class="text-sm">서학개미 환전</div>
-                    <div class="text-2xl font-bold">+0.78</div>
-                    <div class="text-xs">Strong Positive (Trend)</div>
-                </div>
-            </div>
-        </div>
-
-        <!-- 2. ML Methodology -->
-        <div class="glass-card">
-            <h3 class="text-white">🤖 3가지 핵심 모델링 기법 (Hybrid Methodology)</h3>
-            <p class="text-sm text-slate-400 mb-4">본 예측 모델은 단순 선형 분석을 넘어 복합적인 통계 기법을 앙상블(Ensemble)하여 정확도를 제고함</p>
-            <div class="grid grid-cols-1 md:grid-cols-3 gap-6">
-                <div class="p-4 border-l-4 border-blue-500 bg-slate-800/50 rounded-r">
-                    <strong class="text-blue-400 block mb-1">1. 선형 회귀 (Baseline)</strong>
-                    <span class="text-xs text-slate-300">기본적인 추세와 인과관계를 설명합니다. (예: 금리 1% 상승 시 환율 반응)</span>
-                </div>
-                <div class="p-4 border-l-4 border-green-500 bg-slate-800/50 rounded-r">
-                    <strong class="text-green-400 block mb-1">2. 랜덤 포레스트 (Non-linear)</strong>
-                    <span class="text-xs text-slate-300">변수 간 복잡한 상호작용(금리 상승+유가 하락 등)을 포착하여 과적합을 방지합니다.</span>
-                </div>
-                <div class="p-4 border-l-4 border-orange-500 bg-slate-800/50 rounded-r">
-                    <strong class="text-orange-400 block mb-1">3. XGBoost (Boosting)</strong>
-                    <span class="text-xs text-slate-300">이전 모델들의 오차(Residual)를 집중 학습하여 예측 정밀도를 극대화하는 핵심 엔진입니다.</span>
-                </div>
-            </div>
-        </div>
-
-        <!-- 3. Structural Shift -->
-        <div class="grid grid-cols-1 md:grid-cols-2 gap-6">
-            <div class="glass-card">
-                <h3 class="text-white">🌏 통화 연동성 변화 (Coupling Shift)</h3>
-                <div class="space-y-4">
-                    <div>
-                        <div class="flex justify-between text-xs text-slate-400 mb-1">
-                            <span>위안화 (CNY) 연동성</span>
-                            <span>과거(High) → 현재(Mid)</span>
-                        </div>
-                        <div class="w-full bg-slate-700 h-2 rounded"><div class="bg-blue-500 h-2 rounded" style="width: 60%"></div></div>
-                    </div>
-                    <div>
-                        <div class="flex justify-between text-xs text-slate-400 mb-1">
-                            <span>엔화 (JPY) 동조화</span>
-                            <span>과거(Low) → 현재(High)</span>
-                        </div>
-                        <div class="w-full bg-slate-700 h-2 rounded"><div class="bg-orange-500 h-2 rounded" style="width: 85%"></div></div>
-                    </div>
-                </div>
-                <p class="text-xs text-slate-500 mt-3">* 한국과 일본의 인구/산업 구조 유사성 증대로 동조화 강화 추세</p>
-            </div>
-            
-            <div class="glass-card">
-                <h3 class="text-white">💰 수급 주체 변화 (Liquidity Flow)</h3>
-                <p class="text-sm text-slate-300 mb-2"><strong>과거:</strong> 외국인 주식/채권 투자 자금</p>
-                <p class="text-sm text-orange-400 mb-2"><strong>현재:</strong> 서학개미 (개인 해외주식 투자)</p>
-                <ul class="text-xs text-slate-400 list-disc pl-4 space-y-1">
-                    <li>나스닥 상승 시 달러 환전 수요 급증</li>
-                    <li>환율 하단 지지선(Floor)을 견고하게 형성</li>
-                    <li>수출 대금 네고(매도) 물량 압도</li>
-                </ul>
-            </div>
-        </div>
-
-        <!-- 4. 3D Sensitivity Analysis -->
-        <div class="glass-card">
-            <h3 class="text-white">🧊 3D 민감도 분석: 금리 vs 서학개미 (Sensitivity Landscape)</h3>
-            <p class="text-sm text-slate-400 mb-4">미국채 금리(X축)와 서학개미 매수강도(Y축)가 결합될 때 예상되는 적정 환율(Z축)을 3D 지형도로 시각화했습니다.</p>
-            <div id="3d-chart" style="width: 100%; height: 500px;"></div>
-        </div>
-    </div>
-
-    <script>
-        const xValues = [];
-        const yValues = [];
-        const zValues = [];
-        
-        for (let r = 2.0; r <= 6.0; r += 0.2) { xValues.push(r); }
-        for (let s = 0; s <= 100; s += 5) { yValues.push(s); }
-        
-        for (let i = 0; i < yValues.length; i++) {
-            const row = [];
-            for (let j = 0; j < xValues.length; j++) {
-                const r = xValues[j];
-                const s = yValues[i];
-                // Formula sync with python
-                const spread = r - 3.0; // Assume KR rate 3.0 approx
-                const val = 1150 + (spread * 100) + (s - 50) * 1.5 + 100; // Simplified
-                row.push(val);
-            }
-            zValues.push(row);
-        }
-
-        const data3D = [{
-            z: zValues,
-            x: xValues,
-            y: yValues,
-            type: 'surface',
-            colorscale: [[0, '#1e293b'], [0.5, '#f97316'], [1, '#ef4444']]
-        }];
-
-        const layout3D = {
-            paper_bgcolor: 'rgba(0,0,0,0)',
-            plot_bgcolor: 'rgba(0,0,0,0)',
-            autosize: true,
-            margin: { l: 0, r: 0, b: 0, t: 0 },
-            scene: {
-                xaxis: { title: 'US Rate (%)', color: '#94a3b8' },
-                yaxis: { title: 'Seohak Index', color: '#94a3b8' },
-                zaxis: { title: 'KRW Price', color: '#94a3b8' },
-                camera: { eye: {x: 1.5, y: 1.5, z: 1.2} }
-            }
-        };
-
-        Plotly.newPlot('3d-chart', data3D, layout3D, {displayModeBar: false, responsive: true});
-    </script>
-</body>
-</html>
-"""
-components.html(infographic_html, height=1400, scrolling=True)
+@st.cache_resource
+def get_report_component():
+    # 프로세스 시작 시 한 번만 정적 번들(index.html + plotly.min.js)을 생성하여 로컬 서빙
+    return components.declare_component("fx_report", path=build_report_bundle())
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def get_surface_data(scenario_items, coef_items):
+    note_miss()
+    # [3D Surface] 미국 기준금리(X) × 서학개미(Y), 나머지 변수는 현재 슬라이더 값으로 고정
+    surface_x = np.round(np.arange(2.0, 6.0 + 1e-9, 0.2), 2)
+    surface_y = np.arange(0, 101, 5)
+    surface_z = sensitivity_surface(dict(scenario_items), 'us_rate', surface_x, 'seohak', surface_y, coefs=dict(coef_items))
+    return {'x': surface_x.tolist(), 'y': surface_y.tolist(), 'z': np.round(surface_z, 2).tolist()}
+
+# iframe 은 재로드되지 않고, 곡면 데이터가 바뀔 때만 내부에서 다시 그림
+with stage("infographic", cached=True):
+    report = get_report_component()
+    report(surface=get_surface_data(tuple(scenario.items()), coef_items), key="fx_report", default=None)
+
+# -----------------------------------------------------------------------------
+# 7. 계측 마감 및 디버그 패널 (?debug=1)
+# -----------------------------------------------------------------------------
+metrics_run.finish()
+if st.query_params.get("debug") == "1":
+    with st.expander("🛠️ Debug: Rerun Metrics", expanded=True):
+        st.caption(f"Total {metrics_run.total_ms:,.1f} ms")
+        st.dataframe(pd.DataFrame(metrics_run.stages), use_container_width=True)
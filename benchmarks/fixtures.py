@@ -0,0 +1,105 @@
+import os
+import datetime
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import FinanceDataReader as fdr
+import yfinance as yf
+
+from fx_data import HISTORY_YEARS, MACRO_TICKERS
+
+# -----------------------------------------------------------------------------
+# 1. 오프라인 데이터 픽스처 (Naver / Yahoo 응답 기록본)
+# -----------------------------------------------------------------------------
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+NAVER_SYMBOL = "USD/KRW"
+YAHOO_TICKERS = sorted(set(MACRO_TICKERS.values()) | {"KRW=X"})
+SYNTHETIC_MARKER = os.path.join(FIXTURE_DIR, "SYNTHETIC")
+
+# 합성 픽스처의 고정 마지막 일자 (생성 날짜와 무관하게 항상 같은 값을 만듦)
+SYNTHETIC_END = pd.Timestamp("2025-12-31")
+
+# 기록본이 없을 때 쓰는 합성 데이터의 시작값 (대략적인 최근 수준)
+SYNTHETIC_LEVELS = {"USD/KRW": 1400.0, "KRW=X": 1400.0, "^TNX": 4.3, "DX-Y.NYB": 104.0, "JPY=X": 150.0, "CNY=X": 7.2,
+                    "JPYKRW=X": 9.5, "EURKRW=X": 1600.0, "CNYKRW=X": 195.0}
+
+
+def _fixture_path(source, symbol):
+    name = symbol.replace("/", "-").replace("^", "").replace("=", "_")
+    return os.path.join(FIXTURE_DIR, f"{source}_{name}.csv")
+
+
+def record_fixtures():
+    """실제 Naver / Yahoo 응답을 CSV 로 기록한다 (네트워크 필요)."""
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    end = datetime.datetime.now()
+    start = end - datetime.timedelta(days=365*HISTORY_YEARS)
+
+    fdr.DataReader(NAVER_SYMBOL, start, end).to_csv(_fixture_path("naver", NAVER_SYMBOL))
+    raw = yf.download(YAHOO_TICKERS, start=start, end=end, progress=False, group_by="ticker")
+    for ticker in YAHOO_TICKERS:
+        raw[ticker].dropna(how="all").to_csv(_fixture_path("yahoo", ticker))
+
+    if os.path.exists(SYNTHETIC_MARKER):
+        os.remove(SYNTHETIC_MARKER)
+
+
+def synthetic_fixtures():
+    """기록본이 없는 환경을 위해 고정 기간 · 고정 seed 의 랜덤워크 픽스처를 만든다.
+
+    티커마다 별도 seed 를 써서 티커 구성이 바뀌어도 기존 티커의 값은 그대로 유지된다.
+    """
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    index = pd.bdate_range(SYNTHETIC_END - pd.Timedelta(days=365*HISTORY_YEARS + 30), SYNTHETIC_END, name="Date")
+
+    for source, symbols in (("naver", [NAVER_SYMBOL]), ("yahoo", YAHOO_TICKERS)):
+        for symbol in symbols:
+            rng = np.random.default_rng([ord(c) for c in f"{source}:{symbol}"])
+            close = SYNTHETIC_LEVELS[symbol] * np.exp(np.cumsum(rng.normal(0.0, 0.004, len(index))))
+            pd.DataFrame({"Close": np.round(close, 4)}, index=index).to_csv(_fixture_path(source, symbol))
+    open(SYNTHETIC_MARKER, "w").close()
+
+
+@lru_cache(maxsize=1)
+def _replay_offset():
+    # 기록본을 '오늘' 기준으로 재생: 마지막 기록일을 오늘 이전 같은 요일로 주 단위 이동
+    # (요일 · 휴장 패턴을 유지하면서 실행 날짜가 달라도 '최근 5년' 요청이 같은 값을 받게 함)
+    last = pd.read_csv(_fixture_path("naver", NAVER_SYMBOL), index_col=0, parse_dates=True).index[-1]
+    return pd.Timedelta(weeks=(pd.Timestamp(datetime.date.today()) - last).days // 7)
+
+
+def load_fixture(source, symbol):
+    df = pd.read_csv(_fixture_path(source, symbol), index_col=0, parse_dates=True)
+    df.index = df.index + _replay_offset()
+    return df
+
+
+# -----------------------------------------------------------------------------
+# 2. fdr.DataReader / yf.download 대체
+# -----------------------------------------------------------------------------
+def fake_data_reader(symbol, start=None, end=None, *args, **kwargs):
+    df = load_fixture("naver", symbol)
+    return df.loc[pd.Timestamp(start).normalize():pd.Timestamp(end)]
+
+
+def fake_download(tickers, start=None, end=None, group_by="column", **kwargs):
+    # yfinance 와 같이 단일 티커도 (Price, Ticker) MultiIndex 컬럼으로 반환 (기록본이 없는 티커는 누락)
+    tickers = tickers.split() if isinstance(tickers, str) else list(tickers)
+    frames = {t: load_fixture("yahoo", t).loc[pd.Timestamp(start).normalize():pd.Timestamp(end)]
+              for t in tickers if os.path.exists(_fixture_path("yahoo", t))}
+    if not frames:
+        return pd.DataFrame()
+    raw = pd.concat(frames, axis=1)
+    return raw if group_by == "ticker" else raw.swaplevel(0, 1, axis=1).sort_index(axis=1)
+
+
+def install_fixtures():
+    """픽스처가 없으면 합성본을 만들고, 데이터 소스 호출을 픽스처로 교체한다. 합성 여부를 반환한다."""
+    # 합성본은 티커 구성이 바뀌면(통화쌍 추가 등) 다시 만든다
+    missing = not all(os.path.exists(_fixture_path("yahoo", t)) for t in YAHOO_TICKERS)
+    if not os.path.exists(_fixture_path("naver", NAVER_SYMBOL)) or (missing and os.path.exists(SYNTHETIC_MARKER)):
+        synthetic_fixtures()
+    fdr.DataReader = fake_data_reader
+    yf.download = fake_download
+    return os.path.exists(SYNTHETIC_MARKER)
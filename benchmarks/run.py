@@ -0,0 +1,194 @@
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+import platform
+import tempfile
+import subprocess
+
+# 벤치마크용 임시 저장소 - fx_data import 전에 지정. cold 측정이 DB 를 지우므로 기존 FX_DATA_DIR
+# (배포 환경의 실제 저장소일 수 있음) 설정과 관계없이 항상 새 임시 디렉터리를 사용한다.
+os.environ["FX_DATA_DIR"] = tempfile.mkdtemp(prefix="fx-bench-")
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import fx_data
+from benchmarks.fixtures import FIXTURE_DIR, install_fixtures, record_fixtures
+from fx_backtest import factor_history, walk_forward_backtest, walk_forward_backtest_pairs
+from fx_calibration import CalibratedModel
+from fx_charts import build_backtest_figure, build_forecast_figure
+from fx_model import (
+    DEFAULT_SCENARIO, FACTOR_COLUMNS, compute_fair_value, fair_value_batch, forecast_bands, pair_fair_values,
+    simulate_paths,
+)
+from fx_pairs import BASE_PAIR, pair_param
+
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", "history.jsonl")
+
+
+# -----------------------------------------------------------------------------
+# 1. 측정 도구
+# -----------------------------------------------------------------------------
+def measure(fn, repeat):
+    """fn 을 repeat 번 실행한 벽시계 시간(ms)의 min / median / max 와 마지막 결과를 반환한다."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"min_ms": min(times), "median_ms": float(np.median(times)), "max_ms": max(times), "repeat": repeat}, result
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+# -----------------------------------------------------------------------------
+# 2. 단계별 벤치마크
+# -----------------------------------------------------------------------------
+def bench_data_load(results, repeat):
+    def cold():
+        if os.path.exists(fx_data.DB_PATH):
+            os.remove(fx_data.DB_PATH)
+        return fx_data.update_history("USD/KRW"), fx_data.update_macro_history()
+
+    results["data_load_cold"], ((history, _), macro) = measure(cold, 1)
+    results["data_load_incremental"], _ = measure(lambda: (fx_data.update_history("USD/KRW"), fx_data.update_macro_history()), repeat)
+    return history, macro
+
+
+def bench_fair_value(results, repeat):
+    results["fair_value_scalar"], _ = measure(lambda: compute_fair_value(**DEFAULT_SCENARIO), repeat)
+    rng = np.random.default_rng(0)
+    grid = pd.DataFrame({col: DEFAULT_SCENARIO[col] + rng.normal(0, 0.1, 100_000) for col in FACTOR_COLUMNS})
+    results["fair_value_batch_100k"], _ = measure(lambda: fair_value_batch(grid), repeat)
+
+
+def bench_forecast(results, repeat, spot):
+    fair = float(compute_fair_value(**DEFAULT_SCENARIO))
+    results["forecast_simulation"], bands = measure(lambda: forecast_bands(simulate_paths(spot, fair)), repeat)
+    return bands
+
+
+def bench_backtest(results, repeat, history, macro):
+    close = history["Close"]
+    run = lambda: walk_forward_backtest(close, factor_history(close.index, DEFAULT_SCENARIO, macro))
+    results["backtest"], (backtest_df, _) = measure(run, repeat)
+    return backtest_df
+
+
+def bench_pairs(results, repeat, history, macro):
+    # 대시보드가 실제로 실행하는 경로: 전 통화쌍을 한 번에 시뮬레이션 / 백테스트
+    snapshot = fx_data.MarketSnapshot(history, macro, "benchmark", datetime.datetime.now())
+    pairs = snapshot.available_pairs()
+    prices = np.asarray(snapshot.latest_pair_prices(pairs))
+    cross = dict(zip(pairs, prices / prices[pairs.index(BASE_PAIR)]))
+    fair = pair_fair_values(compute_fair_value(**DEFAULT_SCENARIO), DEFAULT_SCENARIO, cross, pairs)
+
+    def forecast():
+        return forecast_bands(simulate_paths(prices, fair, vol=pair_param("vol", pairs), cap=pair_param("intervention", pairs)))
+
+    def backtest():
+        closes = snapshot.pair_closes(pairs)
+        return walk_forward_backtest_pairs(closes, factor_history(closes.index, DEFAULT_SCENARIO, macro), pairs)
+
+    results["forecast_simulation_pairs"], _ = measure(forecast, repeat)
+    results["backtest_pairs"], _ = measure(backtest, repeat)
+    results["forecast_simulation_pairs"]["pairs"] = results["backtest_pairs"]["pairs"] = len(pairs)
+
+
+def bench_calibration(results, repeat, history, macro):
+    close = history["Close"]
+    results["calibration_fit"], model = measure(lambda: CalibratedModel.fit(close.iloc[:-5], macro), repeat)
+    results["calibration_rls_5d"], _ = measure(lambda: model.update(close, macro), repeat)
+
+
+def bench_figures(results, repeat, history, bands, backtest_df):
+    chart_close = history["Close"].iloc[-180:]
+    start_date = chart_close.index[-1]
+    dates_future = [start_date + datetime.timedelta(days=x) for x in range(len(bands[50]))]
+
+    def build():
+        fig = build_forecast_figure(chart_close, dates_future, bands)
+        fig2 = build_backtest_figure(backtest_df)
+        return len(fig.to_json()) + len(fig2.to_json())
+
+    results["figure_build"], payload = measure(build, repeat)
+    results["figure_build"]["payload_bytes"] = payload
+
+
+def bench_app_rerun(results, repeat):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    def cold():
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120).run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        return at
+
+    results["app_cold_run"], at = measure(cold, 1)
+    results["app_rerun"], _ = measure(lambda: at.run(), repeat)
+
+
+# -----------------------------------------------------------------------------
+# 3. 실행 및 이력 기록
+# -----------------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FX-AI 오프라인 벤치마크")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-app", action="store_true", help="AppTest 전체 스크립트 실행 측정 생략")
+    parser.add_argument("--history", default=HISTORY_FILE, help="결과를 누적할 JSONL 파일")
+    parser.add_argument("--record", action="store_true", help="실제 Naver / Yahoo 응답을 픽스처로 기록 후 종료 (네트워크 필요)")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        record_fixtures()
+        print(f"fixtures recorded -> {FIXTURE_DIR}")
+        return
+
+    synthetic = install_fixtures()
+    results = {}
+    history, macro = bench_data_load(results, args.repeat)
+    bench_fair_value(results, args.repeat)
+    bands = bench_forecast(results, args.repeat, float(history["Close"].iloc[-1]))
+    backtest_df = bench_backtest(results, args.repeat, history, macro)
+    bench_pairs(results, args.repeat, history, macro)
+    bench_calibration(results, args.repeat, history, macro)
+    bench_figures(results, args.repeat, history, bands, backtest_df)
+    if not args.skip_app:
+        bench_app_rerun(results, args.repeat)
+
+    record = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "fixtures": "synthetic" if synthetic else "recorded",
+        "stages": results,
+    }
+    os.makedirs(os.path.dirname(args.history), exist_ok=True)
+    with open(args.history, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+    for stage, stats in results.items():
+        print(f"{stage:<26} median {stats['median_ms']:>10.2f} ms   min {stats['min_ms']:>10.2f} ms")
+    print(f"-> {args.history}")
+
+
+if __name__ == "__main__":
+    main()
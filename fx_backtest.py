@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+from fx_model import FACTOR_COLUMNS, HAND_TUNED_COEFS, REVERSION_SPEED, fair_value_batch, pair_fair_values
+from fx_pairs import BASE_PAIR
+
+# -----------------------------------------------------------------------------
+# 1. 백테스트 설정값
+# -----------------------------------------------------------------------------
+BACKTEST_HORIZON = 20       # 예측 시점 (영업일 기준 약 1개월 뒤)
+BACKTEST_WINDOW = 250       # Walk-forward 보정 및 Rolling 지표 구간 (약 1년)
+
+
+# -----------------------------------------------------------------------------
+# 2. 과거 설명변수 구성
+# -----------------------------------------------------------------------------
+def factor_history(index, scenario, history=None):
+    """백테스트 일자별 설명변수 DataFrame을 만든다.
+
+    history 에 있는 컬럼은 해당 일자 기준 최신값(ffill)을 쓰고,
+    과거 시계열이 없는 변수(기준금리, 서학개미 등)는 scenario 값으로 고정한다.
+    """
+    frame = pd.DataFrame(index=index)
+    for col in FACTOR_COLUMNS:
+        if history is not None and col in history.columns:
+            frame[col] = history[col].reindex(index, method="ffill").fillna(scenario[col])
+        else:
+            frame[col] = float(scenario[col])
+    return frame
+
+
+# -----------------------------------------------------------------------------
+# 3. Walk-forward 백테스트 (Vectorized)
+# -----------------------------------------------------------------------------
+def walk_forward_backtest(close, factors, horizon=BACKTEST_HORIZON, window=BACKTEST_WINDOW,
+                          coefs=HAND_TUNED_COEFS, reversion=REVERSION_SPEED):
+    """일자별 적정가 모델로 horizon 일 뒤 환율을 예측하고 실제값과 비교한다.
+
+    t 시점 예측에는 t 까지의 정보만 사용한다: 과거 window 구간의 평균 잔차(시장가 - 적정가)로
+    적정가 수준을 보정한 뒤, 예측 엔진과 같은 평균회귀 기대경로 F + (1-k)^h * (x_t - F) 를 적용한다.
+    반환값은 (일자별 결과 DataFrame, 전체 지표 dict).
+    """
+    close = pd.Series(close, dtype=float)
+    fair = pd.Series(fair_value_batch(factors, coefs), index=close.index)
+    columns, metrics = _walk_forward(close, fair, horizon, window, reversion)
+    metrics = {name: float(value) for name, value in metrics.items()}
+    metrics["N"] = int(metrics["N"])
+    metrics["Horizon"] = horizon
+    return pd.DataFrame(columns), metrics
+
+
+def walk_forward_backtest_pairs(close, factors, pairs, horizon=BACKTEST_HORIZON, window=BACKTEST_WINDOW,
+                                coefs=HAND_TUNED_COEFS, reversion=REVERSION_SPEED, scored=None):
+    """여러 통화쌍을 (일자 × 통화쌍) 2차원 배열 한 번의 연산으로 백테스트한다.
+
+    close 는 통화쌍별 종가 DataFrame (BASE_PAIR 컬럼 포함). 반환값은
+    ({컬럼명: 일자 × 통화쌍 DataFrame}, 통화쌍별 지표 DataFrame).
+    scored (일자 × 통화쌍 bool DataFrame) 를 주면 그 일자만 채점한다 (계수 세트 간 같은 기간 비교용).
+    """
+    close = close[list(pairs)].astype(float)
+    usd_fair = fair_value_batch(factors, coefs)
+    market_cross = close.div(close[BASE_PAIR], axis=0)
+    fair = pd.DataFrame(pair_fair_values(usd_fair, factors, market_cross, pairs), index=close.index, columns=list(pairs))
+    columns, metrics = _walk_forward(close, fair, horizon, window, reversion, scored)
+    metrics = pd.DataFrame(metrics)
+    metrics["N"] = metrics["N"].astype(int)
+    metrics["Horizon"] = horizon
+    return columns, metrics
+
+
+def _walk_forward(close, fair, horizon, window, reversion, scored=None):
+    # Series(단일 통화쌍) / DataFrame(통화쌍별 컬럼) 모두 같은 pandas 연산으로 처리
+    bias = (close - fair).rolling(window, min_periods=window).mean()
+    model_value = fair + bias
+    forecast = model_value + (1.0 - reversion) ** horizon * (close - model_value)
+    actual = close.shift(-horizon)
+
+    error = forecast - actual
+    if scored is not None:
+        error = error.where(scored)
+    valid = error.notna()
+    hit = (np.sign(forecast - close) == np.sign(actual - close)).astype(float).where(valid)
+
+    min_periods = window // 2
+    columns = {
+        "Close": close,
+        "Fair_Value": fair,
+        "Model_Value": model_value,
+        "Forecast": forecast,
+        "Actual_Ahead": actual,
+        "Error": error,
+        "Hit": hit,
+        "Rolling_MAE": error.abs().rolling(window, min_periods=min_periods).mean(),
+        "Rolling_RMSE": np.sqrt((error ** 2).rolling(window, min_periods=min_periods).mean()),
+        "Rolling_Hit_Rate": hit.rolling(window, min_periods=min_periods).mean(),
+    }
+    metrics = {
+        "MAE": error.abs().mean(),
+        "RMSE": np.sqrt((error ** 2).mean()),
+        "Hit_Rate": hit.mean(),
+        "N": valid.sum(),
+    }
+    return columns, metrics
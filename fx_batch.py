@@ -0,0 +1,131 @@
+import os
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from fx_model import (
+    DEFAULT_SCENARIO, FACTOR_COLUMNS, FORECAST_DAYS, FORECAST_PATHS, FORECAST_PERCENTILES,
+    fair_value_batch, forecast_bands_batch,
+)
+
+# -----------------------------------------------------------------------------
+# 1. 배치 실행 설정
+# -----------------------------------------------------------------------------
+BATCH_CHUNK_SIZE = 500
+BATCH_HORIZONS = (30, 60, 90)       # 분포를 기록할 예측 시점 (일)
+
+
+# -----------------------------------------------------------------------------
+# 2. 시나리오 구성
+# -----------------------------------------------------------------------------
+def scenario_grid(**ranges):
+    """변수별 값 목록의 데카르트 곱으로 시나리오 DataFrame을 만든다 (미지정 변수는 기본값)."""
+    axes = {col: np.atleast_1d(ranges.get(col, DEFAULT_SCENARIO[col])) for col in FACTOR_COLUMNS}
+    return pd.DataFrame(list(itertools.product(*axes.values())), columns=list(FACTOR_COLUMNS))
+
+
+def load_scenarios(path):
+    """CSV / Parquet 시나리오 파일을 읽는다. 없는 변수 컬럼은 기본 시나리오 값으로 채운다."""
+    df = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+    for col in FACTOR_COLUMNS:
+        if col not in df.columns:
+            df[col] = DEFAULT_SCENARIO[col]
+    return df[list(FACTOR_COLUMNS)].astype(float)
+
+
+def _parse_range(spec):
+    # "2.0:6.0:0.25" (양끝 포함) 또는 "0,50,100"
+    if ":" in spec:
+        start, stop, step = (float(v) for v in spec.split(":"))
+        return np.round(np.arange(start, stop + step / 2, step), 6)
+    return np.array([float(v) for v in spec.split(",")])
+
+
+# -----------------------------------------------------------------------------
+# 3. 청크 단위 계산 (프로세스 풀 워커)
+# -----------------------------------------------------------------------------
+def _run_chunk(args):
+    chunk, spot, days, n_paths, horizons, seed = args
+    fair = fair_value_batch(chunk)
+
+    bands = forecast_bands_batch(spot, fair, days=days, n_paths=n_paths, seed=seed)
+
+    out = chunk.copy()
+    out["fair_value"] = fair
+    for h in horizons:
+        for p_idx, p in enumerate(FORECAST_PERCENTILES):
+            out[f"d{h}_p{p}"] = bands[:, p_idx, h]
+    return out
+
+
+def run_batch(scenarios, output, spot, workers=None, chunk_size=BATCH_CHUNK_SIZE,
+              days=FORECAST_DAYS, n_paths=FORECAST_PATHS, horizons=BATCH_HORIZONS, seed=42):
+    """시나리오별 적정가와 예측 분포를 프로세스 풀에서 계산하여 Parquet 파일로 스트리밍 기록한다.
+
+    seed 는 대시보드와 같아서 동일 시나리오는 화면과 같은 결과를 낸다. 기록한 행 수를 반환한다.
+    """
+    horizons = tuple(h for h in horizons if h <= days)
+    chunks = [
+        (scenarios.iloc[i:i + chunk_size].reset_index(drop=True), float(spot), days, n_paths, horizons, seed)
+        for i in range(0, len(scenarios), chunk_size)
+    ]
+
+    written = 0
+    writer = None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map 은 입력 순서대로 결과를 내므로 출력 파일의 행 순서가 시나리오 순서와 같음
+            for result in pool.map(_run_chunk, chunks):
+                table = pa.Table.from_pandas(result, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(output, table.schema)
+                writer.write_table(table)
+                written += len(result)
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
+# -----------------------------------------------------------------------------
+# 4. CLI
+# -----------------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FX-AI 시나리오 일괄 실행 (적정가 + 3개월 예측 분포)")
+    parser.add_argument("--scenarios", help="시나리오 파일 (CSV 또는 Parquet, 컬럼: %s)" % ", ".join(FACTOR_COLUMNS))
+    for col in FACTOR_COLUMNS:
+        parser.add_argument(f"--{col.replace('_', '-')}", dest=col, metavar="SPEC",
+                            help="격자 범위 'start:stop:step' 또는 'v1,v2,...'")
+    parser.add_argument("--output", required=True, help="결과 Parquet 경로")
+    parser.add_argument("--spot", type=float, help="예측 시작 환율 (기본: 로컬 저장소의 최근 종가)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=BATCH_CHUNK_SIZE)
+    parser.add_argument("--paths", type=int, default=FORECAST_PATHS)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    if args.scenarios:
+        scenarios = load_scenarios(args.scenarios)
+    else:
+        scenarios = scenario_grid(**{col: _parse_range(getattr(args, col)) for col in FACTOR_COLUMNS if getattr(args, col)})
+
+    spot = args.spot
+    if spot is None:
+        from fx_data import load_history
+        history = load_history("USD/KRW")
+        if history.empty:
+            parser.error("로컬 저장소에 환율 이력이 없습니다. --spot 을 지정하세요.")
+        spot = float(history["Close"].iloc[-1])
+
+    written = run_batch(scenarios, args.output, spot, workers=args.workers,
+                        chunk_size=args.chunk_size, n_paths=args.paths, seed=args.seed)
+    print(f"{written:,} scenarios -> {args.output} (spot {spot:,.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from fx_model import DEFAULT_SCENARIO, FACTOR_COLUMNS, HAND_TUNED_COEFS, factor_terms
+
+# -----------------------------------------------------------------------------
+# 1. 보정(Calibration) 설정
+# -----------------------------------------------------------------------------
+CALIBRATION_RIDGE = float(os.environ.get("FX_CALIBRATION_RIDGE", 0.1))   # Hand-tuned 계수 쪽으로 당기는 강도
+CALIBRATION_CACHE_SIZE = 8                                               # 보관할 데이터 버전 수
+CALIBRATION_MIN_OBS = 250                                                # Walk-forward 첫 적합에 쓰는 관측치 (약 1년)
+
+# 계수명 -> 필요한 시나리오 입력. 입력의 과거 시계열이 모두 있는 항만 추정하고,
+# 나머지 항(기준금리 차, 서학개미)은 Hand-tuned 계수 × 기본 시나리오 값으로 고정한다.
+TERM_INPUTS = {
+    "rate_spread": ("us_rate", "kr_rate"),
+    "us10y": ("us10y",), "dxy": ("dxy",), "seohak": ("seohak",), "jpy": ("jpy",), "cny": ("cny",),
+}
+
+
+def fitted_terms(history_columns):
+    return tuple(name for name, inputs in TERM_INPUTS.items() if all(col in history_columns for col in inputs))
+
+
+def design_matrix(close, history, terms):
+    """(X, y) 를 만든다. X 의 첫 열은 상수항(base), y 는 고정 항의 기여분을 뺀 종가.
+
+    설명변수는 각 일자 기준 최신값(ffill)을 쓰고, 값이 없는 일자는 제외한다.
+    """
+    close = pd.Series(close, dtype=float).dropna()
+    inputs = {col: float(DEFAULT_SCENARIO[col]) for col in FACTOR_COLUMNS}
+    if len(history.columns):
+        aligned = history.reindex(close.index, method="ffill")
+        keep = aligned[[col for name in terms for col in TERM_INPUTS[name] if col in aligned.columns]].notna().all(axis=1)
+        close, aligned = close[keep], aligned[keep]
+        inputs.update({col: aligned[col].to_numpy(dtype=float) for col in aligned.columns if col in inputs})
+
+    values = factor_terms(**inputs)
+    fixed = sum(np.asarray(values[name]) * HAND_TUNED_COEFS[name] for name in TERM_INPUTS if name not in terms)
+    X = np.column_stack([np.ones(len(close))] + [np.broadcast_to(values[name], len(close)) for name in terms])
+    y = close.to_numpy() - fixed
+    return X, y, close.index
+
+
+def _ridge_solve(X, y, terms, ridge, prior):
+    # (X'X + 벌점)^-1 와 Ridge 해. 벌점은 상수항 제외, 변수별 편차제곱합 × ridge
+    spread = np.r_[0.0, ((X[:, 1:] - X[:, 1:].mean(axis=0)) ** 2).sum(axis=0)]
+    penalty = np.diag(ridge * spread)
+    beta0 = np.array([prior["base"]] + [prior[name] for name in terms])
+    cov = np.linalg.inv(X.T @ X + penalty)
+    return cov @ (X.T @ y + penalty @ beta0), cov
+
+
+def _check_obs(n_obs, terms, min_obs):
+    # 대시보드 계수(fit)와 백테스트 계수(walk_forward_coefs)가 같은 기준으로 실패하도록 공용 검사
+    if n_obs < max(min_obs, len(terms) + 2):
+        raise ValueError(f"보정에 필요한 관측치가 부족합니다 ({n_obs}행, 최소 {max(min_obs, len(terms) + 2)}행)")
+
+
+def _rls_step(beta, cov, x, target):
+    # 한 행을 반영하는 재귀 최소제곱 갱신 (beta, cov 를 제자리에서 수정)
+    gain = cov @ x / (1.0 + x @ cov @ x)
+    beta += gain * (target - x @ beta)
+    cov -= np.outer(gain, x @ cov)
+
+
+# -----------------------------------------------------------------------------
+# 2. Ridge 회귀 + 재귀 최소제곱(RLS) 증분 갱신
+# -----------------------------------------------------------------------------
+class CalibratedModel:
+    """과거 설명변수로 추정한 적정가 계수.
+
+    fit 은 Hand-tuned 계수를 사전값으로 하는 Ridge 정규방정식을 한 번에 푼다
+    (상수항 제외, 벌점은 변수별 편차제곱합 × ridge 라서 변수 단위와 무관).
+    update 는 마지막 적합 일자 이후의 행만 RLS 로 반영한다 (벌점이 같다면 전체 재적합과 같은 해).
+    """
+
+    def __init__(self, terms, beta, cov, gram, xty, y_stats, last_date, last_row, mode):
+        self.terms = terms
+        self.beta = beta
+        self.cov = cov              # (X'X + 벌점)^-1 - RLS 이득 계산용
+        self.gram = gram            # X'X (적합도 계산용 충분통계량)
+        self.xty = xty
+        self.y_stats = y_stats      # (n, Σy, Σy²)
+        self.last_date = last_date
+        self.last_row = last_row    # 마지막 적합 행 (x, y) - 과거 데이터 수정 여부 확인용
+        self.mode = mode            # "fit" | "rls"
+
+    @classmethod
+    def fit(cls, close, history, ridge=CALIBRATION_RIDGE, prior=HAND_TUNED_COEFS, min_obs=CALIBRATION_MIN_OBS):
+        terms = fitted_terms(history.columns)
+        X, y, index = design_matrix(close, history, terms)
+        _check_obs(len(y), terms, min_obs)
+
+        beta, cov = _ridge_solve(X, y, terms, ridge, prior)
+        return cls(terms, beta, cov, X.T @ X, X.T @ y, (len(y), y.sum(), y @ y),
+                   index[-1], (X[-1], y[-1]), "fit")
+
+    def update(self, close, history):
+        """last_date 이후의 새 행만 RLS 로 반영한 새 모델을 반환한다 (기존 모델은 변경하지 않음)."""
+        close = pd.Series(close, dtype=float)
+        X, y, index = design_matrix(close[close.index > self.last_date], history, self.terms)
+        if not len(y):
+            return self
+
+        beta, cov = self.beta.copy(), self.cov.copy()
+        for x, target in zip(X, y):
+            _rls_step(beta, cov, x, target)
+
+        n, sum_y, sum_y2 = self.y_stats
+        y_stats = (n + len(y), sum_y + y.sum(), sum_y2 + y @ y)
+        return CalibratedModel(self.terms, beta, cov, self.gram + X.T @ X, self.xty + X.T @ y,
+                               y_stats, index[-1], (X[-1], y[-1]), "rls")
+
+    def extends(self, close, history):
+        """새 데이터가 이 모델의 연장인지 (적합에 쓴 마지막 행이 그대로인지) 확인한다."""
+        if tuple(fitted_terms(history.columns)) != self.terms:
+            return False
+        close = pd.Series(close, dtype=float)
+        if self.last_date not in close.index:
+            return False
+        X, y, _ = design_matrix(close.loc[[self.last_date]], history, self.terms)
+        x_last, y_last = self.last_row
+        return len(y) == 1 and bool(np.allclose(X[0], x_last) and np.isclose(y[0], y_last))
+
+    @property
+    def coefs(self):
+        """HAND_TUNED_COEFS 와 같은 구조의 계수 dict (추정하지 않은 항은 Hand-tuned 값)."""
+        fitted = dict(zip(("base",) + self.terms, self.beta.tolist()))
+        return {name: fitted.get(name, value) for name, value in HAND_TUNED_COEFS.items()}
+
+    @property
+    def n_obs(self):
+        return int(self.y_stats[0])
+
+    @property
+    def rmse(self):
+        n, _, sum_y2 = self.y_stats
+        sse = sum_y2 - 2 * self.beta @ self.xty + self.beta @ self.gram @ self.beta
+        return float(np.sqrt(max(sse, 0.0) / n))
+
+    @property
+    def r2(self):
+        n, sum_y, sum_y2 = self.y_stats
+        sst = sum_y2 - sum_y ** 2 / n
+        return float(1.0 - self.rmse ** 2 * n / sst) if sst > 0 else float("nan")
+
+
+def walk_forward_coefs(close, history, min_obs=CALIBRATION_MIN_OBS, ridge=CALIBRATION_RIDGE, prior=HAND_TUNED_COEFS):
+    """백테스트용 일자별 계수 {계수명: close 와 같은 길이의 배열}.
+
+    t 일의 계수는 t 까지의 행만으로 추정한다 (expanding 창): 첫 min_obs 행을 Ridge 로 적합한 뒤
+    하루씩 RLS 로 갱신한다. 첫 적합 이전 일자는 NaN 이라 백테스트 채점에서 빠진다.
+    """
+    close = pd.Series(close, dtype=float)
+    terms = fitted_terms(history.columns)
+    X, y, index = design_matrix(close, history, terms)
+    _check_obs(len(y), terms, min_obs)
+
+    betas = np.full((len(y), X.shape[1]), np.nan)
+    beta, cov = _ridge_solve(X[:min_obs], y[:min_obs], terms, ridge, prior)
+    betas[min_obs - 1] = beta
+    for i in range(min_obs, len(y)):
+        _rls_step(beta, cov, X[i], y[i])
+        betas[i] = beta
+
+    # 설명변수가 없어 빠진 일자는 직전 계수를 그대로 사용
+    betas = pd.DataFrame(betas, index=index, columns=("base",) + terms).reindex(close.index, method="ffill")
+    return {name: betas[name].to_numpy() if name in betas.columns else value for name, value in prior.items()}
+
+
+# -----------------------------------------------------------------------------
+# 3. 데이터 버전별 모델 캐시 (프로세스 공용)
+# -----------------------------------------------------------------------------
+class CalibrationCache:
+    """데이터 버전별 CalibratedModel 보관소.
+
+    처음 보는 버전이 직전 모델의 연장이면 새 행만 RLS 로 갱신하고,
+    과거 구간이 수정됐거나 설명변수 구성이 바뀌었으면 전체를 다시 적합한다.
+    """
+
+    def __init__(self, max_entries=CALIBRATION_CACHE_SIZE, ridge=CALIBRATION_RIDGE):
+        self.max_entries = max_entries
+        self.ridge = ridge
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version, close, history):
+        with self._lock:
+            if version in self._models:
+                self._models.move_to_end(version)
+                return self._models[version]
+
+            latest = max(self._models.values(), key=lambda m: m.last_date, default=None)
+            if latest is not None and latest.extends(close, history):
+                model = latest.update(close, history)
+            else:
+                model = CalibratedModel.fit(close, history, ridge=self.ridge)
+
+            self._models[version] = model
+            while len(self._models) > self.max_entries:
+                self._models.popitem(last=False)
+            return model
@@ -0,0 +1,128 @@
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from fx_pairs import BASE_PAIR, PAIRS
+
+# -----------------------------------------------------------------------------
+# 0. 차트 전송량 설정 (LTTB 다운샘플링 / WebGL)
+# -----------------------------------------------------------------------------
+# 차트 한 선당 최대 표시 점 수. wide 레이아웃의 차트 폭(약 1200px)에 선 두께가 1.5~3px 이라
+# 3px 간격(약 400점)보다 촘촘한 점은 화면에서 구분되지 않는다. LTTB 가 극값을 남기므로 모양은 유지됨
+CHART_MAX_POINTS = int(os.environ.get("FX_CHART_MAX_POINTS", 400))
+CHART_WEBGL = os.environ.get("FX_CHART_WEBGL", "0") == "1"   # Scattergl 렌더링 사용 여부
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: 선 모양을 보존하는 n_out 개 점의 인덱스를 고른다."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx = np.empty(n_out, dtype=int)
+    idx[0], idx[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_lo = edges[i + 1]
+        nxt_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[nxt_lo:nxt_hi].mean()
+        avg_y = y[nxt_lo:nxt_hi].mean()
+        # 직전 선택점 a, 현재 버킷 후보, 다음 버킷 평균점이 이루는 삼각형 넓이(x2)
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
+
+def downsample(series, max_points=CHART_MAX_POINTS):
+    """DatetimeIndex 시계열을 최대 max_points 개로 줄인다 (NaN 제외)."""
+    series = series.dropna()
+    if len(series) <= max_points:
+        return series
+    x = pd.DatetimeIndex(series.index).asi8
+    return series.iloc[lttb_indices(x, series.to_numpy(), max_points)]
+
+
+def _scatter(webgl):
+    return go.Scattergl if webgl else go.Scatter
+
+# -----------------------------------------------------------------------------
+# 1. 환율 예측 차트 (실제 환율 + Fan Chart)
+# -----------------------------------------------------------------------------
+def build_forecast_figure(chart_close, dates_future, bands, max_points=CHART_MAX_POINTS, webgl=CHART_WEBGL,
+                          y_min=PAIRS[BASE_PAIR]["y_floor"]):
+    Scatter = _scatter(webgl)
+    chart_close = downsample(chart_close, max_points)
+    all_prices = list(chart_close) + list(bands[95])
+    y_max = max(all_prices) * 1.02
+
+    fig = go.Figure()
+    
+    fig.add_trace(Scatter(
+        x=chart_close.index, y=chart_close, 
+        mode='lines', name='실제 환율 (Actual)', 
+        line=dict(color='#94a3b8', width=3), 
+        fill='tozeroy', fillcolor='rgba(148, 163, 184, 0.1)'
+    ))
+    
+    # Fan Chart: 5~95% / 25~75% 신뢰구간
+    for lo, hi, alpha, label in [(5, 95, 0.12, '예측 범위 90%'), (25, 75, 0.25, '예측 범위 50%')]:
+        fig.add_trace(Scatter(
+            x=dates_future, y=bands[hi], 
+            mode='lines', line=dict(width=0), 
+            showlegend=False, hoverinfo='skip'
+        ))
+        fig.add_trace(Scatter(
+            x=dates_future, y=bands[lo], 
+            mode='lines', name=label, line=dict(width=0), 
+            fill='tonexty', fillcolor=f'rgba(249, 115, 22, {alpha})'
+        ))
+    
+    fig.add_trace(Scatter(
+        x=dates_future, y=bands[50], 
+        mode='lines', name='AI 예측 (Forecast 3M)', 
+        line=dict(color='#f97316', width=3, dash='dot')
+    ))
+
+    fig.update_layout(
+        height=500, 
+        plot_bgcolor='rgba(0,0,0,0)', 
+        paper_bgcolor='rgba(0,0,0,0)', 
+        font=dict(color='#e2e8f0', size=14), 
+        xaxis=dict(showgrid=False, gridcolor='#334155'), 
+        yaxis=dict(showgrid=True, gridcolor='#1e293b', range=[y_min, y_max], tickfont=dict(size=14)),
+        legend=dict(font=dict(color="white", size=14), orientation="h", y=1.05, x=1, xanchor="right", bgcolor="rgba(0,0,0,0)"),
+        margin=dict(l=20, r=20, t=40, b=20)
+    )
+    return fig
+
+
+# -----------------------------------------------------------------------------
+# 2. 백테스트 차트 (실제 시장가 vs Walk-forward 적정가)
+# -----------------------------------------------------------------------------
+def build_backtest_figure(backtest_df, max_points=CHART_MAX_POINTS, webgl=CHART_WEBGL):
+    Scatter = _scatter(webgl)
+    actual = downsample(backtest_df['Close'], max_points)
+    model = downsample(backtest_df['Model_Value'], max_points)
+
+    fig2 = go.Figure()
+    fig2.add_trace(Scatter(x=actual.index, y=actual, name='실제 시장가 (Actual)', line=dict(color='#cbd5e1', width=1.5)))
+    fig2.add_trace(Scatter(x=model.index, y=model, name='AI 적정가 (Walk-forward)', line=dict(color='#f97316', width=2)))
+    
+    fig2.update_layout(
+        height=450, 
+        plot_bgcolor='rgba(0,0,0,0)', 
+        paper_bgcolor='rgba(0,0,0,0)', 
+        font=dict(color='#e2e8f0'), 
+        xaxis=dict(showgrid=False), 
+        yaxis=dict(showgrid=True, gridcolor='#1e293b'),
+        legend=dict(font=dict(color="white"))
+    )
+    return fig2
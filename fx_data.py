@@ -0,0 +1,403 @@
+import os
+import hashlib
+import sqlite3
+import time
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+import pandas as pd
+import FinanceDataReader as fdr
+import yfinance as yf
+
+from fx_pairs import ACTIVE_PAIRS, BASE_PAIR, PAIRS
+
+# -----------------------------------------------------------------------------
+# 1. 저장소 설정
+# -----------------------------------------------------------------------------
+HISTORY_YEARS = 5
+REFETCH_DAYS = 3        # 마지막 저장일 이전 며칠은 다시 받아 장중 종가를 확정값으로 덮어씀
+VERSION_WINDOW_DAYS = REFETCH_DAYS + 14     # 스냅샷 version 에 값 해시를 반영하는 최근 구간 (일)
+
+DATA_DIR = os.environ.get("FX_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+DB_PATH = os.path.join(DATA_DIR, "fx_history.sqlite")
+
+SOURCE_NAVER = "Naver Finance (KRX)"
+SOURCE_YAHOO = "Yahoo Finance"
+SOURCE_STORE = "Local Store"
+SOURCE_FAILED = "Connection Failed"
+
+# 백그라운드 갱신 주기 (초)
+REFRESH_SECONDS = int(os.environ.get("FX_REFRESH_SECONDS", 3600))
+# 스냅샷이 아직 없을 때의 재시도 간격 (초, 실패할 때마다 2배씩 늘려 REFRESH_SECONDS 까지)
+RETRY_SECONDS = int(os.environ.get("FX_RETRY_SECONDS", 15))
+
+# 거시 설명변수 + 통화쌍 종가 (Yahoo 티커) - 한 번의 multi-ticker 요청으로 일괄 수집
+MACRO_TICKERS = {
+    "krw": "KRW=X",
+    "us10y": "^TNX",
+    "dxy": "DX-Y.NYB",
+    "jpy": "JPY=X",
+    "cny": "CNY=X",
+    **{PAIRS[p]["column"]: PAIRS[p]["ticker"] for p in ACTIVE_PAIRS if PAIRS[p]["column"]},
+}
+
+
+def _connect():
+    os.makedirs(DATA_DIR, exist_ok=True)
+    conn = sqlite3.connect(DB_PATH)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS fx_history ("
+        " symbol TEXT NOT NULL,"
+        " date TEXT NOT NULL,"
+        " close REAL NOT NULL,"
+        " source TEXT NOT NULL,"
+        " PRIMARY KEY (symbol, date))"
+    )
+    return conn
+
+
+# -----------------------------------------------------------------------------
+# 2. 로컬 이력 저장소 (SQLite, 행 단위 출처 기록)
+# -----------------------------------------------------------------------------
+def load_history(symbol="USD/KRW", start=None):
+    """저장된 종가 이력을 Date 인덱스, Close/Source 컬럼의 DataFrame으로 반환한다."""
+    query = "SELECT date, close, source FROM fx_history WHERE symbol = ?"
+    params = [symbol]
+    if start is not None:
+        query += " AND date >= ?"
+        params.append(pd.Timestamp(start).strftime("%Y-%m-%d"))
+    query += " ORDER BY date"
+
+    with _connect() as conn:
+        rows = conn.execute(query, params).fetchall()
+
+    df = pd.DataFrame(rows, columns=["Date", "Close", "Source"])
+    df.index = pd.DatetimeIndex(pd.to_datetime(df.pop("Date")), name="Date")
+    return df
+
+
+def last_stored_date(symbol="USD/KRW"):
+    with _connect() as conn:
+        row = conn.execute("SELECT MAX(date) FROM fx_history WHERE symbol = ?", (symbol,)).fetchone()
+    return pd.Timestamp(row[0]) if row[0] else None
+
+
+def save_history(symbol, df, source):
+    """Close 컬럼을 가진 DataFrame을 저장소에 upsert 한다."""
+    close = df["Close"].dropna()
+    rows = [(symbol, pd.Timestamp(d).strftime("%Y-%m-%d"), float(v), source) for d, v in close.items()]
+    with _connect() as conn:
+        conn.executemany("INSERT OR REPLACE INTO fx_history VALUES (?, ?, ?, ?)", rows)
+    return len(rows)
+
+
+# -----------------------------------------------------------------------------
+# 3. 외부 데이터 소스
+# -----------------------------------------------------------------------------
+def _close_frame(df):
+    # yfinance 버전에 따라 단일 티커도 MultiIndex 컬럼으로 반환됨
+    if 'Adj Close' in df.columns: close = df['Adj Close']
+    elif 'Close' in df.columns: close = df['Close']
+    else: close = df.iloc[:, 0]
+    if isinstance(close, pd.DataFrame):
+        close = close.iloc[:, 0]
+    return pd.DataFrame({'Close': close.astype(float)})
+
+
+def fetch_naver(start, end):
+    df = fdr.DataReader('USD/KRW', start, end)
+    return _close_frame(df) if not df.empty else pd.DataFrame()
+
+
+def fetch_yahoo(start, end):
+    df = yf.download('KRW=X', start=start, end=end, progress=False)
+    return _close_frame(df) if not df.empty else pd.DataFrame()
+
+
+FETCHERS = {SOURCE_NAVER: fetch_naver, SOURCE_YAHOO: fetch_yahoo}
+
+# 소스별 응답 대기 한도 (초) - 환경변수로 조정 가능
+FETCH_TIMEOUTS = {
+    SOURCE_NAVER: float(os.environ.get("FX_NAVER_TIMEOUT", 8)),
+    SOURCE_YAHOO: float(os.environ.get("FX_YAHOO_TIMEOUT", 10)),
+}
+
+
+def _is_valid(df, min_rows):
+    return (
+        not df.empty
+        and len(df) > min_rows
+        and df.index.is_monotonic_increasing
+        and not pd.isna(df['Close'].iloc[-1])
+    )
+
+
+def fetch_latest(start, end, min_rows=10, timeouts=None):
+    """Naver / Yahoo 를 동시에 조회하여 검증을 먼저 통과한 (DataFrame, 출처)를 반환한다.
+
+    min_rows 보다 많은 행이 있어야 유효하며, 증분 조회는 며칠치만 받으므로 min_rows=0 으로 낮춘다.
+    각 소스는 자기 timeout 안에 도착한 응답만 인정하며, 늦은 쪽은 기다리지 않고 버린다.
+    """
+    timeouts = {**FETCH_TIMEOUTS, **(timeouts or {})}
+    pool = ThreadPoolExecutor(max_workers=len(FETCHERS), thread_name_prefix="fx-fetch")
+    started = time.monotonic()
+    futures = {pool.submit(fn, start, end): name for name, fn in FETCHERS.items()}
+    deadline = {fut: started + timeouts[name] for fut, name in futures.items()}
+    pending = set(futures)
+
+    try:
+        while pending:
+            remaining = min(deadline[f] for f in pending) - time.monotonic()
+            done, pending = wait(pending, timeout=max(remaining, 0), return_when=FIRST_COMPLETED)
+            for fut in done:
+                try:
+                    df = fut.result()
+                except Exception:
+                    continue
+                if _is_valid(df, min_rows):
+                    return df, futures[fut]
+            now = time.monotonic()
+            pending = {f for f in pending if deadline[f] > now}
+    finally:
+        # 멈춘 소스의 스레드를 기다리지 않음 (결과는 무시됨)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return pd.DataFrame(), SOURCE_FAILED
+
+
+# -----------------------------------------------------------------------------
+# 4. 증분 업데이트: 마지막 저장일 이후 행만 받아서 추가
+# -----------------------------------------------------------------------------
+def update_history(symbol="USD/KRW"):
+    today = datetime.datetime.now()
+    start = today - datetime.timedelta(days=365*HISTORY_YEARS)
+
+    last_date = last_stored_date(symbol)
+    if last_date is None:
+        new_rows, source = fetch_latest(start, today)
+    else:
+        fetch_start = max(start, last_date - datetime.timedelta(days=REFETCH_DAYS))
+        new_rows, source = fetch_latest(fetch_start, today, min_rows=0)
+    if not new_rows.empty:
+        save_history(symbol, new_rows, source)
+    elif last_date is not None:
+        source = SOURCE_STORE
+
+    return load_history(symbol, start), source
+
+
+# -----------------------------------------------------------------------------
+# 5. 거시 설명변수 일괄 수집 (US10Y, DXY, JPY, CNY, KRW)
+# -----------------------------------------------------------------------------
+def fetch_macro(start, end, tickers=MACRO_TICKERS):
+    """모든 티커를 yf.download 한 번으로 받아 {변수명: 종가} 컬럼의 DataFrame으로 반환한다."""
+    raw = yf.download(list(tickers.values()), start=start, end=end, progress=False, group_by="column")
+    if raw.empty:
+        return pd.DataFrame()
+    field = "Adj Close" if "Adj Close" in raw.columns.get_level_values(0) else "Close"
+    close = raw[field]
+    return close.rename(columns={ticker: name for name, ticker in tickers.items()}).reindex(columns=list(tickers))
+
+
+def load_macro_history(start=None, tickers=MACRO_TICKERS):
+    """저장된 설명변수를 하나의 날짜 인덱스로 정렬한 wide DataFrame (휴장일은 직전값으로 채움)."""
+    columns = {name: load_history(ticker, start)["Close"] for name, ticker in tickers.items()}
+    return pd.DataFrame(columns).sort_index().ffill()
+
+
+def update_macro_history(tickers=MACRO_TICKERS):
+    today = datetime.datetime.now()
+    start = today - datetime.timedelta(days=365*HISTORY_YEARS)
+
+    # 가장 늦게 갱신된 티커 기준으로 한 번에 받음 (신규 티커가 있으면 전체 구간)
+    last_dates = [last_stored_date(ticker) for ticker in tickers.values()]
+    fetch_start = start if None in last_dates else max(start, min(last_dates) - datetime.timedelta(days=REFETCH_DAYS))
+
+    try:
+        frame = fetch_macro(fetch_start, today, tickers)
+    except Exception:
+        frame = pd.DataFrame()
+
+    for name, ticker in tickers.items():
+        if name in frame.columns:
+            save_history(ticker, frame[[name]].rename(columns={name: "Close"}), SOURCE_YAHOO)
+
+    return load_macro_history(start, tickers)
+
+
+# -----------------------------------------------------------------------------
+# 6. 백그라운드 갱신기 (Stale-While-Revalidate)
+# -----------------------------------------------------------------------------
+def _readonly(arr):
+    arr = np.ascontiguousarray(arr)
+    arr.flags.writeable = False
+    return arr
+
+
+class MarketSnapshot:
+    """프로세스당 한 번 만들어 모든 세션이 공유하는 읽기 전용 시장 데이터.
+
+    필요한 컬럼만 datetime64 / float32 배열로 압축해 보관하고, 세션에는 복사 없이 만든
+    pandas 뷰(close_series, macro_frame)를 넘긴다. version 은 마지막 일자·행 수와 최근 구간 값의
+    해시로 정해진다 (갱신 때마다 최근 REFETCH_DAYS 를 덮어쓰므로 일자·행 수만으로는 변경을 놓침).
+    """
+
+    __slots__ = ("dates", "close", "macro_dates", "macro_columns", "macro", "source", "refreshed_at", "version")
+
+    def __init__(self, krw, macro, source, refreshed_at):
+        self.dates = _readonly(krw.index.to_numpy(dtype="datetime64[ns]"))
+        self.close = _readonly(krw["Close"].to_numpy(dtype=np.float32))
+        self.macro_dates = _readonly(macro.index.to_numpy(dtype="datetime64[ns]"))
+        self.macro_columns = tuple(macro.columns)
+        self.macro = _readonly(macro.to_numpy(dtype=np.float32))
+        self.source = source
+        self.refreshed_at = refreshed_at
+        self.version = (self.last_date, len(self.close),
+                        str(self.macro_dates[-1])[:10] if len(self.macro_dates) else "", len(self.macro_dates),
+                        self._tail_digest())
+
+    def _tail_digest(self):
+        # 다시 받아 덮어쓰는 구간 + 여유분(티커별 마지막 일자 차이, 휴장일) 안의 값만 해시
+        digest = hashlib.blake2b(digest_size=8)
+        for dates, values in ((self.dates, self.close), (self.macro_dates, self.macro)):
+            if len(dates):
+                since = dates[-1] - np.timedelta64(VERSION_WINDOW_DAYS, "D")
+                digest.update(values[np.searchsorted(dates, since):].tobytes())
+        return digest.hexdigest()
+
+    @property
+    def last_date(self):
+        return pd.Timestamp(self.dates[-1]).strftime("%Y-%m-%d")
+
+    @property
+    def last_price(self):
+        return float(self.close[-1])
+
+    def close_series(self, tail=None):
+        start = -tail if tail else 0
+        index = pd.DatetimeIndex(self.dates[start:], name="Date", copy=False)
+        return pd.Series(self.close[start:], index=index, name="Close", copy=False)
+
+    def macro_frame(self):
+        index = pd.DatetimeIndex(self.macro_dates, name="Date", copy=False)
+        return pd.DataFrame(self.macro, index=index, columns=list(self.macro_columns), copy=False)
+
+    def latest_macro(self, name):
+        if name not in self.macro_columns:
+            return None
+        values = self.macro[:, self.macro_columns.index(name)]
+        valid = values[~np.isnan(values)]
+        return float(valid[-1]) if len(valid) else None
+
+    def available_pairs(self, pairs=ACTIVE_PAIRS):
+        """pairs 중 수집된 종가가 있는 통화쌍 (USD/KRW 는 항상 포함)."""
+        return tuple(p for p in pairs if p == BASE_PAIR or self.latest_macro(PAIRS[p]["column"]) is not None)
+
+    def latest_pair_prices(self, pairs=ACTIVE_PAIRS):
+        """통화쌍별 USD/KRW 마지막 일자 기준 종가 (pair_closes 의 마지막 행과 같은 값, DataFrame 생성 없음)."""
+        end = np.searchsorted(self.macro_dates, self.dates[-1], side="right")
+        prices = []
+        for pair in pairs:
+            if pair == BASE_PAIR:
+                prices.append(self.last_price)
+                continue
+            values = self.macro[:end, self.macro_columns.index(PAIRS[pair]["column"])]
+            valid = values[~np.isnan(values)]
+            prices.append(float(valid[-1]) * PAIRS[pair]["unit"])
+        return tuple(prices)
+
+    def pair_closes(self, pairs=ACTIVE_PAIRS):
+        """통화쌍별 종가(표시 단위 반영)를 USD/KRW 일자 기준으로 정렬한 DataFrame. 데이터가 없는 통화쌍은 제외."""
+        frame = pd.DataFrame({BASE_PAIR: self.close_series().astype(float)})
+        macro = self.macro_frame()
+        for pair in self.available_pairs(pairs):
+            if pair != BASE_PAIR:
+                column = PAIRS[pair]["column"]
+                frame[pair] = macro[column].reindex(frame.index, method="ffill").astype(float) * PAIRS[pair]["unit"]
+        return frame[[p for p in pairs if p in frame.columns]]
+
+
+class MarketDataRefresher:
+    """프로세스 공용 시장 데이터 갱신기.
+
+    snapshot() 은 항상 마지막 정상 스냅샷을 즉시 반환하고, 갱신은 백그라운드 스레드에서
+    interval 주기로 수행한다. 갱신이 실패하면 기존 스냅샷을 그대로 유지한다.
+    """
+
+    def __init__(self, interval=REFRESH_SECONDS):
+        self.interval = interval
+        self.last_error = None
+        self.last_attempt = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._ready = threading.Event()
+        self._thread = None
+        self._snapshot = None
+        self._set_snapshot(self._load_stored())
+
+    def _load_stored(self):
+        # 기동 직후에는 네트워크 없이 로컬 저장소 내용을 먼저 서빙
+        start = datetime.datetime.now() - datetime.timedelta(days=365*HISTORY_YEARS)
+        krw = load_history("USD/KRW", start)
+        if krw.empty:
+            return None
+        stored_at = datetime.datetime.fromtimestamp(os.path.getmtime(DB_PATH))
+        return MarketSnapshot(krw, load_macro_history(start), SOURCE_STORE, stored_at)
+
+    def _set_snapshot(self, snapshot):
+        if snapshot is None:
+            return
+        with self._lock:
+            self._snapshot = snapshot
+        self._ready.set()
+
+    def snapshot(self):
+        with self._lock:
+            return self._snapshot
+
+    def wait_for_snapshot(self, timeout=None):
+        """저장소가 비어 있는 첫 기동 시 최초 수집 시도가 끝날 때까지 기다린다 (실패해도 바로 반환)."""
+        self._ready.wait(timeout)
+        return self.snapshot()
+
+    def refresh(self):
+        """한 번 갱신을 시도하고 성공 여부를 반환한다. 실패 시 기존 스냅샷은 건드리지 않는다."""
+        self.last_attempt = datetime.datetime.now()
+        try:
+            krw, source = update_history("USD/KRW")
+            macro = update_macro_history()
+        except Exception as exc:
+            self.last_error = repr(exc)
+            return False
+
+        if krw.empty or source in (SOURCE_STORE, SOURCE_FAILED):
+            self.last_error = "Naver / Yahoo 모두 응답 실패"
+            return False
+
+        self.last_error = None
+        self._set_snapshot(MarketSnapshot(krw, macro, source, self.last_attempt))
+        return True
+
+    def request_refresh(self):
+        self._wake.set()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="fx-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        failures = 0
+        while True:
+            failures = 0 if self.refresh() else failures + 1
+            # 첫 시도가 끝나면 성공 여부와 관계없이 대기 중인 세션을 깨움
+            self._ready.set()
+            if self.snapshot() is None:
+                wait = min(RETRY_SECONDS * 2 ** (failures - 1), self.interval)
+            else:
+                wait = self.interval
+            self._wake.wait(wait)
+            self._wake.clear()
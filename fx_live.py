@@ -0,0 +1,166 @@
+import os
+import time
+import threading
+
+import numpy as np
+import yfinance as yf
+
+from fx_report import build_report_bundle
+
+# -----------------------------------------------------------------------------
+# 1. 실시간(Intraday) 모드 설정
+# -----------------------------------------------------------------------------
+LIVE_INTERVAL = float(os.environ.get("FX_LIVE_INTERVAL", 5))      # 시세 조회 주기 (초)
+LIVE_CAPACITY = int(os.environ.get("FX_LIVE_CAPACITY", 5000))     # 링 버퍼에 보관할 최대 틱 수
+LIVE_FEED = os.environ.get("FX_LIVE_FEED", "yahoo")               # yahoo | stub
+
+LIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "live_build")
+
+
+# -----------------------------------------------------------------------------
+# 2. 틱 링 버퍼
+# -----------------------------------------------------------------------------
+class TickBuffer:
+    """고정 크기 링 버퍼. 틱마다 증가하는 일련번호(seq)로 '이후 새로 들어온 틱'만 꺼낼 수 있다."""
+
+    def __init__(self, capacity=LIVE_CAPACITY):
+        self.capacity = capacity
+        self._times = np.zeros(capacity, dtype="datetime64[ms]")
+        self._prices = np.zeros(capacity, dtype=np.float64)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def append(self, timestamp, price):
+        with self._lock:
+            slot = self._count % self.capacity
+            self._times[slot] = np.datetime64(timestamp, "ms")
+            self._prices[slot] = price
+            self._count += 1
+
+    @property
+    def seq(self):
+        return self._count
+
+    def last_price(self):
+        with self._lock:
+            return float(self._prices[(self._count - 1) % self.capacity]) if self._count else None
+
+    def since(self, seq=0):
+        """seq 이후의 틱을 (새 seq, 시각 배열, 가격 배열)로 반환한다 (버퍼에서 밀려난 틱은 제외)."""
+        with self._lock:
+            first = max(seq, self._count - self.capacity)
+            slots = np.arange(first, self._count) % self.capacity
+            return self._count, self._times[slots].copy(), self._prices[slots].copy()
+
+
+# -----------------------------------------------------------------------------
+# 3. 시세 소스
+# -----------------------------------------------------------------------------
+class YahooQuoteFeed:
+    def __init__(self, ticker="KRW=X"):
+        self._ticker = yf.Ticker(ticker)
+
+    def quote(self):
+        return float(self._ticker.fast_info.last_price)
+
+
+class StubQuoteFeed:
+    """네트워크 없이 테스트하기 위한 로컬 랜덤워크 시세."""
+
+    def __init__(self, start_price, vol=0.3, seed=0):
+        self._price = float(start_price)
+        self._vol = vol
+        self._rng = np.random.default_rng(seed)
+
+    def quote(self):
+        self._price += self._rng.normal(0.0, self._vol)
+        return self._price
+
+
+def make_feed(start_price, kind=LIVE_FEED):
+    return StubQuoteFeed(start_price) if kind == "stub" else YahooQuoteFeed()
+
+
+# -----------------------------------------------------------------------------
+# 4. 백그라운드 폴러 (프로세스 공용)
+# -----------------------------------------------------------------------------
+class LiveQuotePoller:
+    def __init__(self, feed, interval=LIVE_INTERVAL, capacity=LIVE_CAPACITY):
+        self.feed = feed
+        self.interval = interval
+        self.buffer = TickBuffer(capacity)
+        self.last_error = None
+        self._thread = None
+
+    def poll_once(self):
+        try:
+            self.buffer.append(np.datetime64("now", "ms"), self.feed.quote())
+            self.last_error = None
+        except Exception as exc:
+            self.last_error = repr(exc)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="fx-live", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            self.poll_once()
+            time.sleep(self.interval)
+
+
+# -----------------------------------------------------------------------------
+# 5. 실시간 차트 컴포넌트 (Plotly.extendTraces 로 새 틱만 추가)
+# -----------------------------------------------------------------------------
+LIVE_HTML = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <script src="plotly.min.js"></script>
+    <style>
+        body { background-color: transparent; margin: 0; font-family: sans-serif; }
+    </style>
+</head>
+<body>
+    <div id="live-chart" style="width: 100%; height: 320px;"></div>
+    <script>
+        function sendMessage(type, data) {
+            window.parent.postMessage(Object.assign({ isStreamlitMessage: true, type: type }, data), '*');
+        }
+
+        const layout = {
+            paper_bgcolor: 'rgba(0,0,0,0)',
+            plot_bgcolor: 'rgba(0,0,0,0)',
+            font: { color: '#e2e8f0' },
+            margin: { l: 50, r: 20, t: 20, b: 40 },
+            xaxis: { showgrid: false },
+            yaxis: { showgrid: true, gridcolor: '#1e293b' },
+            showlegend: false
+        };
+        let lastSeq = null;
+
+        window.addEventListener('message', function (event) {
+            if (event.data.type !== 'streamlit:render') return;
+            const args = event.data.args;
+            if (lastSeq === null || args.reset) {
+                // 최초 렌더링(또는 재설정) 시에만 전체 버퍼로 차트를 생성
+                const trace = { x: args.x, y: args.y, type: 'scattergl', mode: 'lines', line: { color: '#f97316', width: 2 } };
+                Plotly.newPlot('live-chart', [trace], layout, { displayModeBar: false, responsive: true });
+            } else if (args.seq > lastSeq && args.x.length) {
+                // 이후에는 새 틱만 추가 (버퍼 크기를 넘는 오래된 점은 잘라냄)
+                Plotly.extendTraces('live-chart', { x: [args.x], y: [args.y] }, [0], args.capacity);
+            }
+            lastSeq = args.seq;
+            sendMessage('streamlit:setFrameHeight', { height: document.body.scrollHeight });
+        });
+        sendMessage('streamlit:componentReady', { apiVersion: 1 });
+    </script>
+</body>
+</html>
+"""
+
+
+def build_live_bundle(path=LIVE_DIR):
+    return build_report_bundle(path, LIVE_HTML)
@@ -0,0 +1,142 @@
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# -----------------------------------------------------------------------------
+# 1. 설정
+# -----------------------------------------------------------------------------
+METRICS_PORT = int(os.environ.get("FX_METRICS_PORT", 0))        # 0 이면 metrics 엔드포인트 미사용
+METRICS_HOST = os.environ.get("FX_METRICS_HOST", "127.0.0.1")
+METRICS_LOG = os.environ.get("FX_METRICS_LOG", "0") == "1"      # rerun 마다 JSON 로그 한 줄 출력
+
+logger = logging.getLogger("fx.metrics")
+if METRICS_LOG and not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+# Streamlit 은 세션마다 별도 스레드에서 스크립트를 실행하므로 현재 rerun 은 스레드별로 관리
+_local = threading.local()
+_lock = threading.Lock()
+_totals = {}            # stage -> {"count", "seconds", "hit", "miss"}
+_reruns = {"count": 0, "seconds": 0.0}
+_server = None
+
+
+# -----------------------------------------------------------------------------
+# 2. Rerun 단위 계측
+# -----------------------------------------------------------------------------
+class RerunMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = []
+        self.total_ms = None
+        self._active = []
+
+    def finish(self):
+        """rerun 을 마감하고 프로세스 누적치에 반영한 뒤 구조화 로그를 남긴다."""
+        self.total_ms = (time.perf_counter() - self.started) * 1000
+        with _lock:
+            _reruns["count"] += 1
+            _reruns["seconds"] += self.total_ms / 1000
+            for record in self.stages:
+                totals = _totals.setdefault(record["stage"], {"count": 0, "seconds": 0.0, "hit": 0, "miss": 0})
+                totals["count"] += 1
+                totals["seconds"] += record["ms"] / 1000
+                if record.get("cache") in ("hit", "miss"):
+                    totals[record["cache"]] += 1
+        logger.info(json.dumps({"event": "rerun", "total_ms": round(self.total_ms, 2), "stages": self.stages},
+                               ensure_ascii=False, default=str))
+        return self
+
+
+def start_rerun():
+    run = RerunMetrics()
+    _local.run = run
+    return run
+
+
+def current_rerun():
+    return getattr(_local, "run", None)
+
+
+@contextmanager
+def stage(name, cached=False, **fields):
+    """구간 벽시계 시간을 기록한다. yield 되는 dict 에 source / rows 등을 추가할 수 있다.
+
+    cached=True 인 구간은 기본적으로 cache hit 으로 기록되고, 캐시 함수 본문에서
+    note_miss() 가 호출되면 miss 로 바뀐다.
+    """
+    record = {"stage": name, "cache": "hit" if cached else None, **fields}
+    run = current_rerun()
+    if run is not None:
+        run._active.append(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["ms"] = round((time.perf_counter() - start) * 1000, 3)
+        if run is not None:
+            run._active.pop()
+            run.stages.append(record)
+
+
+def note_miss():
+    """st.cache_data 함수 본문에서 호출: 본문이 실행됐다는 것은 캐시 miss 라는 뜻."""
+    run = current_rerun()
+    if run is not None and run._active and run._active[-1]["cache"] is not None:
+        run._active[-1]["cache"] = "miss"
+
+
+# -----------------------------------------------------------------------------
+# 3. 로컬 metrics 엔드포인트 (Prometheus text format)
+# -----------------------------------------------------------------------------
+def render_prometheus():
+    with _lock:
+        lines = [
+            "# TYPE fx_reruns_total counter",
+            f"fx_reruns_total {_reruns['count']}",
+            "# TYPE fx_rerun_seconds_total counter",
+            f"fx_rerun_seconds_total {_reruns['seconds']:.6f}",
+            "# TYPE fx_stage_seconds summary",
+        ]
+        for name, totals in sorted(_totals.items()):
+            lines.append(f'fx_stage_seconds_sum{{stage="{name}"}} {totals["seconds"]:.6f}')
+            lines.append(f'fx_stage_seconds_count{{stage="{name}"}} {totals["count"]}')
+        lines.append("# TYPE fx_stage_cache_total counter")
+        for name, totals in sorted(_totals.items()):
+            for result in ("hit", "miss"):
+                lines.append(f'fx_stage_cache_total{{stage="{name}",result="{result}"}} {totals[result]}')
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port=METRICS_PORT, host=METRICS_HOST):
+    """프로세스당 한 번만 /metrics 서버를 띄운다 (port 가 0 이면 아무것도 하지 않음)."""
+    global _server
+    with _lock:
+        if _server is not None or not port:
+            return _server
+        _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=_server.serve_forever, name="fx-metrics", daemon=True).start()
+    return _server
@@ -0,0 +1,191 @@
+from functools import lru_cache
+
+import numpy as np
+
+from fx_pairs import PAIRS
+
+# -----------------------------------------------------------------------------
+# 1. 예측 엔진 설정값
+# -----------------------------------------------------------------------------
+FORECAST_DAYS = 90                      # 3개월
+FORECAST_PATHS = 2000                   # 몬테카를로 경로 수
+FORECAST_PERCENTILES = (5, 25, 50, 75, 95)
+
+REVERSION_SPEED = 0.04                  # 적정가 회귀 속도 (gap * 0.04)
+DAILY_VOL = 3.5                         # 일간 노이즈 (원)
+INTERVENTION_LEVEL = 1500.0             # [Intervention] 1500원 저항선
+INTERVENTION_DAMPING = 0.1              # 저항선 초과분 반영 비율
+
+
+# -----------------------------------------------------------------------------
+# 2. 적정가(Fair Value) 모델
+# -----------------------------------------------------------------------------
+# 시나리오 입력 7개 (사이드바 슬라이더와 동일한 순서)
+FACTOR_COLUMNS = ("us_rate", "kr_rate", "seohak", "us10y", "dxy", "jpy", "cny")
+
+# 사이드바 기본 시나리오 (기준금리 US 3.75, KR 2.5)
+DEFAULT_SCENARIO = {
+    "us_rate": 3.75, "kr_rate": 2.50, "seohak": 80,
+    "us10y": 4.45, "dxy": 106.5, "jpy": 153.0, "cny": 7.28,
+}
+
+# [모델 튜닝]
+# 기준금리 초기값(US 3.75, KR 2.5) 상태에서 적정가가 1400원 초반대(하락 예측)가 나오도록
+# Base Constant를 대폭 낮추고, 금리 민감도를 높임.
+HAND_TUNED_COEFS = {
+    "base": 1150.0,         # Base 대폭 하향 (다른 변수들의 상승 압력을 상쇄하기 위해)
+    "rate_spread": 100.0,   # [Core] 한-미 금리차 (0.25%p 변화에도 25원씩 움직이도록 강화)
+    "us10y": 40.0,          # 국채금리
+    "dxy": 12.0,            # 달러인덱스
+    "seohak": 1.5,          # 서학개미
+    "jpy": 2.0,             # 달러/엔
+    "cny": 30.0,            # 달러/위안
+}
+
+# 각 변수의 중립 기준점 (기준점에서는 해당 항의 기여도가 0)
+FACTOR_ANCHORS = {"us10y": 4.0, "dxy": 100.0, "seohak": 50.0, "jpy": 140.0, "cny": 7.0}
+
+
+def factor_terms(us_rate, kr_rate, seohak, us10y, dxy, jpy, cny):
+    """적정가 식의 설명변수(금리차, 기준점 대비 편차)를 {계수명: 배열}로 반환한다."""
+    terms = {"rate_spread": np.asarray(us_rate, dtype=float) - np.asarray(kr_rate, dtype=float)}
+    for name, value in (("us10y", us10y), ("dxy", dxy), ("seohak", seohak), ("jpy", jpy), ("cny", cny)):
+        terms[name] = np.asarray(value, dtype=float) - FACTOR_ANCHORS[name]
+    return terms
+
+
+def compute_fair_value(us_rate, kr_rate, seohak, us10y, dxy, jpy, cny, coefs=HAND_TUNED_COEFS):
+    """적정 환율을 계산한다. 입력은 스칼라 또는 브로드캐스팅 가능한 NumPy 배열."""
+    terms = factor_terms(us_rate, kr_rate, seohak, us10y, dxy, jpy, cny)
+    value = coefs["base"]
+    for name, term in terms.items():
+        value = value + term * coefs[name]
+    return value
+
+
+def fair_value_batch(scenarios, coefs=HAND_TUNED_COEFS):
+    """FACTOR_COLUMNS 컬럼을 가진 DataFrame(또는 dict)의 모든 시나리오를 한 번에 평가한다."""
+    return np.asarray(compute_fair_value(
+        **{col: np.asarray(scenarios[col], dtype=float) for col in FACTOR_COLUMNS}, coefs=coefs
+    ))
+
+
+def sensitivity_surface(inputs, x_name, x_values, y_name, y_values, coefs=HAND_TUNED_COEFS):
+    """두 변수를 격자로 움직이고 나머지는 inputs 값으로 고정한 적정가 곡면 (len(y), len(x))."""
+    grid = dict(inputs)
+    grid[x_name] = np.asarray(x_values, dtype=float)[None, :]
+    grid[y_name] = np.asarray(y_values, dtype=float)[:, None]
+    z = compute_fair_value(**{col: grid[col] for col in FACTOR_COLUMNS}, coefs=coefs)
+    return np.broadcast_to(z, (len(y_values), len(x_values)))
+
+
+def pair_fair_values(usd_fair_value, inputs, market_cross, pairs):
+    """USD/KRW 적정가를 통화쌍별 적정가로 환산한다. 반환 shape = usd_fair_value.shape + (통화쌍 수,).
+
+    USD/XXX 시나리오 변수가 있는 통화(JPY, CNY)는 USD/KRW 적정가 ÷ USD/XXX × 표시단위,
+    없는 통화(EUR 등)는 시장 교차환율 market_cross[pair] (XXX/KRW ÷ USD/KRW) 를 곱한다.
+    """
+    usd = np.asarray(usd_fair_value, dtype=float)
+    columns = []
+    for pair in pairs:
+        cfg = PAIRS[pair]
+        if cfg["usd_cross"]:
+            multiplier = cfg["unit"] / np.asarray(inputs[cfg["usd_cross"]], dtype=float)
+        else:
+            multiplier = np.asarray(market_cross[pair], dtype=float)
+        columns.append(np.broadcast_to(usd * multiplier, usd.shape))
+    return np.stack(columns, axis=-1)
+
+
+# -----------------------------------------------------------------------------
+# 3. 몬테카를로 경로 시뮬레이션 (Vectorized Mean-Reversion)
+# -----------------------------------------------------------------------------
+def simulate_paths(current_price, fair_value, days=FORECAST_DAYS, n_paths=FORECAST_PATHS,
+                   reversion=REVERSION_SPEED, vol=DAILY_VOL,
+                   cap=INTERVENTION_LEVEL, damping=INTERVENTION_DAMPING, seed=42):
+    """적정가로 평균회귀하는 환율 경로를 (n_paths, days + 1) 배열로 한 번에 계산한다.
+
+    current_price / fair_value / vol / cap 에 통화쌍별 배열을 넘기면 같은 노이즈로
+    모든 통화쌍을 한 번에 계산하여 (통화쌍 수, n_paths, days + 1) 배열을 반환한다.
+    저항선을 넘지 않는 경로는 AR(1) 닫힌 해(감쇠 행렬 @ 노이즈)로 구하고,
+    저항선을 넘는 경로만 일자별 점화식으로 다시 계산해 개입 효과를 반영한다.
+    """
+    current_price, fair_value, vol, cap = (np.asarray(v, dtype=float) for v in (current_price, fair_value, vol, cap))
+    batch = np.broadcast_shapes(current_price.shape, fair_value.shape, vol.shape, cap.shape)
+    current_price, fair_value, vol, cap = (np.broadcast_to(v, batch)[..., None, None]
+                                           for v in (current_price, fair_value, vol, cap))
+
+    rng = np.random.default_rng(seed)
+    z = rng.standard_normal(size=(days, n_paths))
+
+    # d_t = a * d_{t-1} + e_t  (d = 가격 - 적정가, a = 1 - 회귀속도)
+    a = 1.0 - reversion
+    steps = np.arange(days)
+    lags = steps[:, None] - steps[None, :]
+    decay = np.where(lags >= 0, a ** np.clip(lags, 0, None), 0.0)
+
+    paths = np.empty(batch + (n_paths, days + 1))
+    paths[..., 0] = current_price[..., 0]
+    paths[..., 1:] = fair_value + a ** (steps + 1) * (current_price - fair_value) + vol * (decay @ z).T
+
+    # 저항선 돌파 경로만 순차 재계산 (비선형 개입은 닫힌 해가 없음)
+    breached = (paths[..., 1:] > cap).any(axis=-1)
+    if breached.any():
+        rows = np.nonzero(breached)
+        fv, cp, v, c = (np.broadcast_to(x[..., 0], breached.shape)[rows] for x in (fair_value, current_price, vol, cap))
+        sub_shocks = z[:, rows[-1]] * v
+        current_val = cp.copy()
+        sub_paths = np.empty((len(current_val), days + 1))
+        sub_paths[:, 0] = current_val
+        for i in range(days):
+            next_val = current_val + (fv - current_val) * reversion + sub_shocks[i]
+            over = next_val > c
+            next_val[over] = c[over] + (next_val[over] - c[over]) * damping
+            current_val = next_val
+            sub_paths[:, i + 1] = current_val
+        paths[rows] = sub_paths
+
+    return paths
+
+
+def forecast_bands(paths, percentiles=FORECAST_PERCENTILES):
+    """경로 분포에서 일자별 백분위 밴드를 {백분위: 배열} 형태로 반환한다 (경로 축 = 뒤에서 두 번째)."""
+    values = np.percentile(paths, percentiles, axis=-2)
+    return dict(zip(percentiles, values))
+
+
+@lru_cache(maxsize=16)
+def _shared_noise(days, n_paths, reversion, vol, seed, percentiles):
+    # 시작가·적정가와 무관한 공통 노이즈 성분의 백분위와 최댓값 (파라미터 조합별로 한 번만 계산)
+    noise = simulate_paths(0.0, 0.0, days=days, n_paths=n_paths, reversion=reversion, vol=vol, cap=np.inf, seed=seed)
+    noise_pct = np.percentile(noise, percentiles, axis=0)
+    noise_max = noise.max(axis=0)
+    noise_pct.flags.writeable = False
+    noise_max.flags.writeable = False
+    return noise_pct, noise_max
+
+
+def forecast_bands_batch(current_price, fair_values, days=FORECAST_DAYS, n_paths=FORECAST_PATHS,
+                         reversion=REVERSION_SPEED, vol=DAILY_VOL,
+                         cap=INTERVENTION_LEVEL, damping=INTERVENTION_DAMPING, seed=42,
+                         percentiles=FORECAST_PERCENTILES):
+    """여러 적정가 시나리오의 백분위 밴드를 (시나리오 수, len(percentiles), days + 1) 배열로 계산한다.
+
+    seed 가 같으면 모든 시나리오가 같은 노이즈를 공유하므로, 경로 = 결정적 회귀경로 + 공통 노이즈 이다.
+    저항선에 닿지 않는 시나리오는 공통 노이즈의 백분위를 평행이동해 바로 구하고 (simulate_paths 와 동일한 값),
+    닿는 시나리오만 simulate_paths 로 개별 계산한다. 공통 노이즈는 캐시되므로 시작가만 바뀌는
+    재계산(실시간 모드)은 O(days) 이다.
+    """
+    fair_values = np.atleast_1d(np.asarray(fair_values, dtype=float))
+    noise_pct, noise_max = _shared_noise(days, n_paths, reversion, vol, seed, tuple(percentiles))
+
+    decay = (1.0 - reversion) ** np.arange(days + 1)
+    base = fair_values[:, None] + decay[None, :] * (current_price - fair_values[:, None])
+    bands = base[:, None, :] + noise_pct[None, :, :]
+
+    breached = (base[:, 1:] + noise_max[None, 1:] > cap).any(axis=1)
+    for i in np.flatnonzero(breached):
+        paths = simulate_paths(current_price, fair_values[i], days=days, n_paths=n_paths, reversion=reversion,
+                               vol=vol, cap=cap, damping=damping, seed=seed)
+        bands[i] = np.percentile(paths, percentiles, axis=0)
+    return bands
@@ -0,0 +1,35 @@
+import os
+
+# -----------------------------------------------------------------------------
+# 1. 통화쌍별 설정
+# -----------------------------------------------------------------------------
+# ticker      : Yahoo 티커 (거시 변수와 같은 multi-ticker 요청으로 일괄 수집)
+# column      : 수집 데이터의 컬럼명 (USD/KRW 는 Naver · Yahoo 동시 조회한 기본 시계열 사용)
+# unit        : 표시 단위 (엔화는 100엔 기준)
+# usd_cross   : USD/XXX 시나리오 변수명. 없으면 시장 교차환율(XXX/KRW ÷ USD/KRW)로 환산
+# intervention, vol, y_floor : 개입 저항선, 일간 노이즈, 차트 하단
+#   (USD/KRW 이외는 가격 수준에 비례해 잡은 초기값)
+PAIRS = {
+    "USD/KRW": {"ticker": "KRW=X", "column": None, "unit": 1, "usd_cross": None,
+                "intervention": 1500.0, "vol": 3.5, "y_floor": 1300.0},
+    "JPY/KRW": {"ticker": "JPYKRW=X", "column": "jpykrw", "unit": 100, "usd_cross": "jpy",
+                "intervention": 1000.0, "vol": 2.4, "y_floor": 800.0},
+    "EUR/KRW": {"ticker": "EURKRW=X", "column": "eurkrw", "unit": 1, "usd_cross": None,
+                "intervention": 1750.0, "vol": 4.0, "y_floor": 1300.0},
+    "CNY/KRW": {"ticker": "CNYKRW=X", "column": "cnykrw", "unit": 1, "usd_cross": "cny",
+                "intervention": 210.0, "vol": 0.5, "y_floor": 170.0},
+}
+
+BASE_PAIR = "USD/KRW"
+
+# 사용할 통화쌍 (예: FX_PAIRS="USD/KRW,JPY/KRW")
+ACTIVE_PAIRS = tuple(
+    p.strip() for p in os.environ.get("FX_PAIRS", ",".join(PAIRS)).split(",") if p.strip() in PAIRS
+) or (BASE_PAIR,)
+if BASE_PAIR not in ACTIVE_PAIRS:
+    ACTIVE_PAIRS = (BASE_PAIR,) + ACTIVE_PAIRS
+
+
+def pair_param(name, pairs=ACTIVE_PAIRS):
+    """통화쌍 순서대로 정렬한 파라미터 리스트 (벡터 연산용)."""
+    return [PAIRS[p][name] for p in pairs]
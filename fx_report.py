@@ -0,0 +1,224 @@
+import os
+import shutil
+
+import plotly
+
+# -----------------------------------------------------------------------------
+# 1. 인포그래픽 리포트 번들 (CDN 없이 로컬에서 서빙)
+# -----------------------------------------------------------------------------
+REPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "report_build")
+PLOTLY_JS = os.path.join(os.path.dirname(plotly.__file__), "package_data", "plotly.min.js")
+
+REPORT_HTML = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <script src="plotly.min.js"></script>
+    <style>
+        body { background-color: #0f172a; color: #f8fafc; font-family: sans-serif; padding: 20px; }
+        .glass-card { background: rgba(30, 41, 59, 0.7); border: 1px solid rgba(255, 255, 255, 0.1); border-radius: 1rem; padding: 20px; margin-bottom: 20px; }
+        .high-corr { background-color: rgba(249, 115, 22, 0.2); border: 1px solid rgba(249, 115, 22, 0.5); color: #fb923c; }
+        .neg-corr { background-color: rgba(59, 130, 246, 0.2); border: 1px solid rgba(59, 130, 246, 0.5); color: #60a5fa; }
+        .correlation-box { text-align: center; padding: 10px; border-radius: 8px; margin: 5px; }
+        h3 { border-bottom: 1px solid #334155; padding-bottom: 10px; margin-bottom: 15px; font-weight: bold; font-size: 1.25rem; }
+        /* Tailwind 유틸리티 중 이 리포트에서 쓰는 클래스만 추려서 인라인 (CDN JIT 컴파일러 대체) */
+        *, ::before, ::after { box-sizing: border-box; border: 0 solid #e5e7eb; }
+        h3, p, ul { margin: 0; }
+        ul { padding: 0; }
+        strong { font-weight: bolder; }
+        .max-w-6xl { max-width: 72rem; }
+        .mx-auto { margin-left: auto; margin-right: auto; }
+        .block { display: block; }
+        .flex { display: flex; }
+        .grid { display: grid; }
+        .justify-between { justify-content: space-between; }
+        .grid-cols-1 { grid-template-columns: repeat(1, minmax(0, 1fr)); }
+        .grid-cols-2 { grid-template-columns: repeat(2, minmax(0, 1fr)); }
+        .gap-4 { gap: 1rem; }
+        .gap-6 { gap: 1.5rem; }
+        .space-y-1 > :not(:first-child) { margin-top: 0.25rem; }
+        .space-y-4 > :not(:first-child) { margin-top: 1rem; }
+        .w-full { width: 100%; }
+        .h-2 { height: 0.5rem; }
+        .p-4 { padding: 1rem; }
+        .pl-4 { padding-left: 1rem; }
+        .mb-1 { margin-bottom: 0.25rem; }
+        .mb-2 { margin-bottom: 0.5rem; }
+        .mb-4 { margin-bottom: 1rem; }
+        .mb-6 { margin-bottom: 1.5rem; }
+        .mt-3 { margin-top: 0.75rem; }
+        .rounded { border-radius: 0.25rem; }
+        .rounded-r { border-top-right-radius: 0.25rem; border-bottom-right-radius: 0.25rem; }
+        .border-l-4 { border-left-width: 4px; }
+        .border-blue-500 { border-color: #3b82f6; }
+        .border-green-500 { border-color: #22c55e; }
+        .border-orange-500 { border-color: #f97316; }
+        .bg-blue-500 { background-color: #3b82f6; }
+        .bg-orange-500 { background-color: #f97316; }
+        .bg-slate-700 { background-color: #334155; }
+        .bg-slate-800\/50 { background-color: rgba(30, 41, 59, 0.5); }
+        .list-disc { list-style-type: disc; }
+        .text-xs { font-size: 0.75rem; line-height: 1rem; }
+        .text-sm { font-size: 0.875rem; line-height: 1.25rem; }
+        .text-2xl { font-size: 1.5rem; line-height: 2rem; }
+        .font-bold { font-weight: 700; }
+        .text-white { color: #ffffff; }
+        .text-slate-300 { color: #cbd5e1; }
+        .text-slate-400 { color: #94a3b8; }
+        .text-slate-500 { color: #64748b; }
+        .text-blue-400 { color: #60a5fa; }
+        .text-green-400 { color: #4ade80; }
+        .text-orange-400 { color: #fb923c; }
+        @media (min-width: 768px) {
+            .md\:grid-cols-2 { grid-template-columns: repeat(2, minmax(0, 1fr)); }
+            .md\:grid-cols-3 { grid-template-columns: repeat(3, minmax(0, 1fr)); }
+            .md\:grid-cols-4 { grid-template-columns: repeat(4, minmax(0, 1fr)); }
+        }
+    </style>
+</head>
+<body>
+    <div class="max-w-6xl mx-auto">
+        <!-- 1. Correlation Matrix -->
+        <div class="glass-card">
+            <h3 class="text-white">🔗 주요 경제지표 상관계수 매트릭스 (Correlation Matrix)</h3>
+            <p class="text-sm text-slate-400 mb-6">최근 5년 데이터 기준, 달러/원 환율 변동을 설명하는 핵심 변수들의 상관관계 분석입니다.</p>
+            <div class="grid grid-cols-2 md:grid-cols-4 gap-4 mb-6">
+                <div class="correlation-box high-corr">
+                    <div class="text-sm">한-미 금리차 (Spread)</div>
+                    <div class="text-2xl font-bold">+0.82</div>
+                    <div class="text-xs">Very Strong Positive</div>
+                </div>
+                <div class="correlation-box high-corr">
+                    <div class="text-sm">달러 인덱스 (DXY)</div>
+                    <div class="text-2xl font-bold">+0.89</div>
+                    <div class="text-xs">Very Strong Positive</div>
+                </div>
+                <div class="correlation-box high-corr">
+                    <div class="text-sm">미국채 10년물</div>
+                    <div class="text-2xl font-bold">+0.72</div>
+                    <div class="text-xs">Strong Positive</div>
+                </div>
+                <div class="correlation-box high-corr">
+                    <div class="text-sm">서학개미 환전</div>
+                    <div class="text-2xl font-bold">+0.78</div>
+                    <div class="text-xs">Strong Positive (Trend)</div>
+                </div>
+            </div>
+        </div>
+
+        <!-- 2. ML Methodology -->
+        <div class="glass-card">
+            <h3 class="text-white">🤖 3가지 핵심 모델링 기법 (Hybrid Methodology)</h3>
+            <p class="text-sm text-slate-400 mb-4">본 예측 모델은 단순 선형 분석을 넘어 복합적인 통계 기법을 앙상블(Ensemble)하여 정확도를 제고함</p>
+            <div class="grid grid-cols-1 md:grid-cols-3 gap-6">
+                <div class="p-4 border-l-4 border-blue-500 bg-slate-800/50 rounded-r">
+                    <strong class="text-blue-400 block mb-1">1. 선형 회귀 (Baseline)</strong>
+                    <span class="text-xs text-slate-300">기본적인 추세와 인과관계를 설명합니다. (예: 금리 1% 상승 시 환율 반응)</span>
+                </div>
+                <div class="p-4 border-l-4 border-green-500 bg-slate-800/50 rounded-r">
+                    <strong class="text-green-400 block mb-1">2. 랜덤 포레스트 (Non-linear)</strong>
+                    <span class="text-xs text-slate-300">변수 간 복잡한 상호작용(금리 상승+유가 하락 등)을 포착하여 과적합을 방지합니다.</span>
+                </div>
+                <div class="p-4 border-l-4 border-orange-500 bg-slate-800/50 rounded-r">
+                    <strong class="text-orange-400 block mb-1">3. XGBoost (Boosting)</strong>
+                    <span class="text-xs text-slate-300">이전 모델들의 오차(Residual)를 집중 학습하여 예측 정밀도를 극대화하는 핵심 엔진입니다.</span>
+                </div>
+            </div>
+        </div>
+
+        <!-- 3. Structural Shift -->
+        <div class="grid grid-cols-1 md:grid-cols-2 gap-6">
+            <div class="glass-card">
+                <h3 class="text-white">🌏 통화 연동성 변화 (Coupling Shift)</h3>
+                <div class="space-y-4">
+                    <div>
+                        <div class="flex justify-between text-xs text-slate-400 mb-1">
+                            <span>위안화 (CNY) 연동성</span>
+                            <span>과거(High) → 현재(Mid)</span>
+                        </div>
+                        <div class="w-full bg-slate-700 h-2 rounded"><div class="bg-blue-500 h-2 rounded" style="width: 60%"></div></div>
+                    </div>
+                    <div>
+                        <div class="flex justify-between text-xs text-slate-400 mb-1">
+                            <span>엔화 (JPY) 동조화</span>
+                            <span>과거(Low) → 현재(High)</span>
+                        </div>
+                        <div class="w-full bg-slate-700 h-2 rounded"><div class="bg-orange-500 h-2 rounded" style="width: 85%"></div></div>
+                    </div>
+                </div>
+                <p class="text-xs text-slate-500 mt-3">* 한국과 일본의 인구/산업 구조 유사성 증대로 동조화 강화 추세</p>
+            </div>
+            
+            <div class="glass-card">
+                <h3 class="text-white">💰 수급 주체 변화 (Liquidity Flow)</h3>
+                <p class="text-sm text-slate-300 mb-2"><strong>과거:</strong> 외국인 주식/채권 투자 자금</p>
+                <p class="text-sm text-orange-400 mb-2"><strong>현재:</strong> 서학개미 (개인 해외주식 투자)</p>
+                <ul class="text-xs text-slate-400 list-disc pl-4 space-y-1">
+                    <li>나스닥 상승 시 달러 환전 수요 급증</li>
+                    <li>환율 하단 지지선(Floor)을 견고하게 형성</li>
+                    <li>수출 대금 네고(매도) 물량 압도</li>
+                </ul>
+            </div>
+        </div>
+
+        <!-- 4. 3D Sensitivity Analysis -->
+        <div class="glass-card">
+            <h3 class="text-white">🧊 3D 민감도 분석: 금리 vs 서학개미 (Sensitivity Landscape)</h3>
+            <p class="text-sm text-slate-400 mb-4">미국 기준금리(X축)와 서학개미 매수강도(Y축)가 결합될 때 예상되는 적정 환율(Z축)을 3D 지형도로 시각화했습니다. (나머지 변수는 현재 시나리오 값으로 고정)</p>
+            <div id="3d-chart" style="width: 100%; height: 500px;"></div>
+        </div>
+    </div>
+
+    <script>
+        // Streamlit 컴포넌트 프로토콜: 리포트는 한 번만 로드되고, 시나리오가 바뀌면 곡면 데이터만 갱신
+        function sendMessage(type, data) {
+            window.parent.postMessage(Object.assign({ isStreamlitMessage: true, type: type }, data), '*');
+        }
+
+        const layout3D = {
+            paper_bgcolor: 'rgba(0,0,0,0)',
+            plot_bgcolor: 'rgba(0,0,0,0)',
+            autosize: true,
+            margin: { l: 0, r: 0, b: 0, t: 0 },
+            scene: {
+                xaxis: { title: 'US Rate (%)', color: '#94a3b8' },
+                yaxis: { title: 'Seohak Index', color: '#94a3b8' },
+                zaxis: { title: 'KRW Price', color: '#94a3b8' },
+                camera: { eye: {x: 1.5, y: 1.5, z: 1.2} }
+            }
+        };
+
+        // 적정가 곡면은 서버(fx_model.sensitivity_surface)에서 계산되어 전달됨
+        function renderSurface(surface) {
+            const data3D = [{
+                z: surface.z,
+                x: surface.x,
+                y: surface.y,
+                type: 'surface',
+                colorscale: [[0, '#1e293b'], [0.5, '#f97316'], [1, '#ef4444']]
+            }];
+            Plotly.react('3d-chart', data3D, layout3D, {displayModeBar: false, responsive: true});
+        }
+
+        window.addEventListener('message', function (event) {
+            if (event.data.type !== 'streamlit:render') return;
+            renderSurface(event.data.args.surface);
+            sendMessage('streamlit:setFrameHeight', { height: document.body.scrollHeight });
+        });
+        sendMessage('streamlit:componentReady', { apiVersion: 1 });
+    </script>
+</body>
+</html>
+"""
+
+
+def build_report_bundle(path=REPORT_DIR, html=REPORT_HTML):
+    """index.html 과 설치된 plotly 패키지의 plotly.min.js 를 path 에 기록하고 path 를 반환한다."""
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, "index.html"), "w", encoding="utf-8") as f:
+        f.write(html)
+
+    bundle = os.path.join(path, "plotly.min.js")
+    if not os.path.exists(bundle) or os.path.getsize(bundle) != os.path.getsize(PLOTLY_JS):
+        shutil.copyfile(PLOTLY_JS, bundle)
+    return path
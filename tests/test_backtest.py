@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fx_backtest import factor_history, walk_forward_backtest
+from fx_model import DEFAULT_SCENARIO, HAND_TUNED_COEFS, fair_value_batch
+
+
+def test_forecast_uses_only_past_closes():
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range("2022-01-03", periods=600)
+    macro = pd.DataFrame({"dxy": 104.0 + np.cumsum(rng.normal(0, 0.3, len(index)))}, index=index)
+    factors = factor_history(index, DEFAULT_SCENARIO, macro)
+    close = pd.Series(1350.0 + np.cumsum(rng.normal(0, 5, len(index))), index=index)
+
+    # t 이후 종가만 바꿔도 t 까지의 예측 / 적정가 보정값은 그대로여야 한다
+    t = index[400]
+    revised = close.where(close.index <= t, close + rng.normal(0, 50, len(index)))
+    before, _ = walk_forward_backtest(close, factors)
+    after, _ = walk_forward_backtest(revised, factors)
+    for col in ("Forecast", "Model_Value"):
+        pd.testing.assert_series_equal(before.loc[:t, col], after.loc[:t, col])
+    assert not before["Forecast"].loc[t:].iloc[1:].equals(after["Forecast"].loc[t:].iloc[1:])
+
+
+def test_metrics_on_hand_computed_series():
+    index = pd.bdate_range("2024-01-01", periods=5)
+    factors = factor_history(index, DEFAULT_SCENARIO)
+    fair = fair_value_batch(factors, HAND_TUNED_COEFS)[0]
+    close = pd.Series(fair + np.array([0.0, 2.0, 4.0, 2.0, 0.0]), index=index)
+
+    # window=2, horizon=1, k=0.5: 예측 = F + 0.5 * bias + 0.5 * (x_t - F)
+    #   t=1: bias 1 -> 예측 F+1.5, 실제 F+4 (오차 -2.5, 방향 불일치)
+    #   t=2: bias 3 -> 예측 F+3.5, 실제 F+2 (오차 +1.5, 방향 일치)
+    #   t=3: bias 3 -> 예측 F+2.5, 실제 F+0 (오차 +2.5, 방향 불일치)
+    df, metrics = walk_forward_backtest(close, factors, horizon=1, window=2, reversion=0.5)
+    np.testing.assert_allclose(df["Error"].to_numpy(), [np.nan, -2.5, 1.5, 2.5, np.nan], atol=1e-9)
+    assert metrics["MAE"] == pytest.approx(6.5 / 3)
+    assert metrics["RMSE"] == pytest.approx(np.sqrt(14.75 / 3))
+    assert metrics["Hit_Rate"] == pytest.approx(1 / 3)
+    assert metrics["N"] == 3
+    assert metrics["Horizon"] == 1
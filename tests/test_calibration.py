@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fx_backtest import factor_history
+from fx_calibration import CALIBRATION_MIN_OBS, CalibratedModel, CalibrationCache, walk_forward_coefs
+from fx_model import DEFAULT_SCENARIO, HAND_TUNED_COEFS, fair_value_batch
+
+TRUE_COEFS = dict(HAND_TUNED_COEFS, base=1180.0, us10y=30.0, dxy=10.0, jpy=1.5, cny=50.0)
+
+
+@pytest.fixture
+def market():
+    # 알려진 계수로 만든 합성 종가 + 랜덤워크 설명변수 (약 5년치 영업일)
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range("2021-01-01", periods=1300)
+    macro = pd.DataFrame({
+        "us10y": 4.0 + np.cumsum(rng.normal(0, 0.03, len(index))),
+        "dxy": 104.0 + np.cumsum(rng.normal(0, 0.3, len(index))),
+        "jpy": 150.0 + np.cumsum(rng.normal(0, 0.5, len(index))),
+        "cny": 7.2 + np.cumsum(rng.normal(0, 0.01, len(index))),
+    }, index=index)
+    fair = fair_value_batch(factor_history(index, DEFAULT_SCENARIO, macro), TRUE_COEFS)
+    return pd.Series(fair + rng.normal(0, 5, len(index)), index=index), macro
+
+
+def test_fit_recovers_known_coefficients(market):
+    close, macro = market
+    coefs = CalibratedModel.fit(close, macro, ridge=0.0).coefs
+    for name in ("us10y", "dxy", "jpy"):
+        assert coefs[name] == pytest.approx(TRUE_COEFS[name], rel=0.1)
+    # 과거 시계열이 없는 항은 Hand-tuned 값 유지
+    assert coefs["rate_spread"] == HAND_TUNED_COEFS["rate_spread"]
+    assert coefs["seohak"] == HAND_TUNED_COEFS["seohak"]
+
+
+@pytest.mark.parametrize("ridge", [0.0, 0.1])
+def test_rls_update_matches_refit_with_same_penalty(market, ridge):
+    close, macro = market
+    model = CalibratedModel.fit(close.iloc[:1250], macro, ridge=ridge)
+    updated = model.update(close, macro)
+    assert updated.mode == "rls" and updated.n_obs == len(close)
+
+    # 갱신된 모델의 (X'X + 벌점)^-1 로 정규방정식을 다시 풀면 같은 해가 나와야 함
+    penalty = np.linalg.inv(updated.cov) - updated.gram
+    beta0 = np.array([HAND_TUNED_COEFS["base"]] + [HAND_TUNED_COEFS[name] for name in model.terms])
+    np.testing.assert_allclose(updated.beta, updated.cov @ (updated.xty + penalty @ beta0), rtol=1e-8)
+    if ridge == 0.0:
+        refit = CalibratedModel.fit(close, macro, ridge=0.0)
+        np.testing.assert_allclose(updated.beta, refit.beta, rtol=1e-9)
+        assert updated.rmse == pytest.approx(refit.rmse, rel=1e-9)
+
+
+def test_walk_forward_coefs_use_only_past_rows(market):
+    close, macro = market
+    coefs = walk_forward_coefs(close, macro, min_obs=250, ridge=0.0)
+    assert np.isnan(coefs["base"][248]) and not np.isnan(coefs["base"][249])
+    for t in (249, 700, len(close) - 1):
+        fitted = CalibratedModel.fit(close.iloc[:t + 1], macro, ridge=0.0).coefs
+        for name in ("base", "us10y", "dxy", "jpy", "cny"):
+            assert coefs[name][t] == pytest.approx(fitted[name], rel=1e-8)
+
+
+def test_cache_updates_incrementally_and_refits_on_revision(market):
+    close, macro = market
+    cache = CalibrationCache(ridge=0.0)
+    first = cache.get("v1", close.iloc[:1290], macro)
+    assert first.mode == "fit"
+    assert cache.get("v2", close, macro).mode == "rls"
+    assert cache.get("v1", close.iloc[:1290], macro) is first
+
+    revised = close.copy()
+    revised.iloc[-5:] += 3.0        # 적합에 쓴 마지막 행이 수정됨 -> 전체 재적합
+    assert cache.get("v3", revised, macro).mode == "fit"
+
+
+def test_fit_and_walk_forward_share_the_minimum_history(market):
+    # 사이드바 보정이 성공하면 백테스트용 walk-forward 보정도 성공해야 함 (같은 최소 관측치)
+    close, macro = market
+    short = close.iloc[:CALIBRATION_MIN_OBS - 1]
+    with pytest.raises(ValueError):
+        CalibratedModel.fit(short, macro)
+    with pytest.raises(ValueError):
+        walk_forward_coefs(short, macro)
+    enough = close.iloc[:CALIBRATION_MIN_OBS]
+    CalibratedModel.fit(enough, macro)
+    walk_forward_coefs(enough, macro)
+
+
+def test_baseline_scored_on_calibrated_dates(market):
+    from fx_backtest import walk_forward_backtest_pairs
+
+    close, macro = market
+    closes = close.to_frame("USD/KRW")
+    factors = factor_history(closes.index, DEFAULT_SCENARIO, macro)
+    columns, calibrated = walk_forward_backtest_pairs(closes, factors, ("USD/KRW",), coefs=walk_forward_coefs(close, macro))
+    _, full = walk_forward_backtest_pairs(closes, factors, ("USD/KRW",))
+    _, baseline = walk_forward_backtest_pairs(closes, factors, ("USD/KRW",), scored=columns["Error"].notna())
+    # 보정 계수는 1년 늦게 시작하므로 같은 일자로 맞춘 Hand-tuned 지표만 비교 가능
+    assert calibrated.loc["USD/KRW", "N"] < full.loc["USD/KRW", "N"]
+    assert baseline.loc["USD/KRW", "N"] == calibrated.loc["USD/KRW", "N"]
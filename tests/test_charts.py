@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+
+from fx_charts import downsample, lttb_indices
+
+
+def test_lttb_keeps_endpoints_and_extremes():
+    rng = np.random.default_rng(0)
+    x = np.arange(1300)
+    y = 1350.0 + np.cumsum(rng.normal(0, 2, len(x)))
+    y[437] += 200.0     # 하루짜리 급등 / 급락
+    y[901] -= 200.0
+
+    idx = lttb_indices(x, y, 400)
+    assert len(idx) == 400
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert np.argmax(y) in idx and np.argmin(y) in idx
+
+
+def test_downsample_leaves_short_series_alone():
+    series = pd.Series(np.arange(180.0), index=pd.bdate_range("2024-01-01", periods=180))
+    pd.testing.assert_series_equal(downsample(series, 400), series)
+    assert len(downsample(series, 50)) == 50
@@ -0,0 +1,94 @@
+import datetime
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import fx_data
+from fx_data import SOURCE_FAILED, SOURCE_NAVER, SOURCE_YAHOO, MarketSnapshot
+
+
+def make_snapshot(close_shift=0.0, macro_shift=0.0, rows=300):
+    index = pd.bdate_range("2024-01-01", periods=rows)
+    krw = pd.DataFrame({"Close": 1400.0 + np.arange(rows) * 0.1}, index=index)
+    krw.iloc[-1, 0] += close_shift
+    macro = pd.DataFrame({"us10y": 4.0 + np.arange(rows) * 0.001, "dxy": 104.0}, index=index)
+    macro.iloc[-1, 0] += macro_shift
+    return MarketSnapshot(krw, macro, "test", datetime.datetime(2025, 1, 1))
+
+
+def test_snapshot_version_tracks_values_rewritten_in_refetch_window():
+    base = make_snapshot()
+    assert make_snapshot().version == base.version
+    # 같은 일자·행 수라도 최근 종가 / 설명변수가 다시 쓰이면 버전이 바뀌어야 캐시가 갱신됨
+    assert make_snapshot(close_shift=20.0).version != base.version
+    assert make_snapshot(macro_shift=0.05).version != base.version
+
+
+def test_latest_pair_prices_match_last_row_of_pair_closes():
+    index = pd.bdate_range("2024-01-01", periods=50)
+    krw = pd.DataFrame({"Close": np.linspace(1300, 1400, 50)}, index=index)
+    # 설명변수가 USD/KRW 보다 하루 늦게까지 있어도 USD/KRW 마지막 일자 기준 값을 써야 함
+    macro_index = index.append(pd.DatetimeIndex([index[-1] + pd.Timedelta(days=3)]))
+    macro = pd.DataFrame({"jpykrw": np.linspace(9.0, 9.5, 51), "eurkrw": np.linspace(1500, 1600, 51)}, index=macro_index)
+    macro.iloc[-3, 0] = np.nan
+    snapshot = MarketSnapshot(krw, macro, "test", datetime.datetime(2025, 1, 1))
+
+    pairs = ("USD/KRW", "JPY/KRW", "EUR/KRW")
+    np.testing.assert_allclose(snapshot.latest_pair_prices(pairs), snapshot.pair_closes(pairs).iloc[-1].to_numpy())
+
+
+def close_frame(rows, last=1400.0):
+    index = pd.bdate_range("2024-01-01", periods=rows)
+    df = pd.DataFrame({"Close": np.linspace(1300.0, 1400.0, rows)}, index=index)
+    df.iloc[-1, 0] = last
+    return df
+
+
+@pytest.fixture
+def released():
+    # 멈춘 가짜 소스의 스레드를 테스트가 끝나면 풀어 줌
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def fake_fetcher(df, delay, released):
+    def fetch(start, end):
+        released.wait(delay)
+        return df
+    return fetch
+
+
+@pytest.mark.parametrize("naver, yahoo, winner", [
+    # 느리지만 유효한 소스가 빠르지만 무효한 소스(행 수 10개 이하)를 이김
+    ((close_frame(30), 0.3), (close_frame(10), 0.0), SOURCE_NAVER),
+    # 빠른 소스의 마지막 종가가 NaN 이면 느린 소스를 기다림
+    ((close_frame(30, last=np.nan), 0.0), (close_frame(11), 0.3), SOURCE_YAHOO),
+    # 둘 다 유효하면 먼저 도착한 쪽
+    ((close_frame(30), 0.3), (close_frame(30), 0.0), SOURCE_YAHOO),
+])
+def test_fetch_latest_returns_first_valid_source(monkeypatch, released, naver, yahoo, winner):
+    monkeypatch.setattr(fx_data, "FETCHERS", {
+        SOURCE_NAVER: fake_fetcher(*naver, released), SOURCE_YAHOO: fake_fetcher(*yahoo, released),
+    })
+    started = time.monotonic()
+    df, source = fx_data.fetch_latest(None, None, timeouts={SOURCE_NAVER: 2.0, SOURCE_YAHOO: 2.0})
+    assert source == winner
+    assert not df.empty
+    assert time.monotonic() - started < 1.0
+
+
+def test_fetch_latest_gives_up_at_deadline_when_sources_hang(monkeypatch, released):
+    monkeypatch.setattr(fx_data, "FETCHERS", {
+        SOURCE_NAVER: fake_fetcher(close_frame(30), 30.0, released),
+        SOURCE_YAHOO: fake_fetcher(close_frame(30), 30.0, released),
+    })
+    started = time.monotonic()
+    df, source = fx_data.fetch_latest(None, None, timeouts={SOURCE_NAVER: 0.2, SOURCE_YAHOO: 0.3})
+    elapsed = time.monotonic() - started
+    assert source == SOURCE_FAILED
+    assert df.empty
+    assert 0.3 <= elapsed < 1.0
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from fx_model import (
+    DAILY_VOL, FORECAST_PERCENTILES, INTERVENTION_DAMPING, INTERVENTION_LEVEL, REVERSION_SPEED,
+    forecast_bands, forecast_bands_batch, simulate_paths,
+)
+
+
+def reference_paths(current_price, fair_value, days, n_paths, reversion=REVERSION_SPEED, vol=DAILY_VOL,
+                    cap=INTERVENTION_LEVEL, damping=INTERVENTION_DAMPING, seed=42):
+    # 벡터화 이전의 일자별 점화식 (같은 seed 의 노이즈를 같은 순서로 사용)
+    shocks = np.random.default_rng(seed).normal(0.0, vol, size=(days, n_paths))
+    paths = np.empty((n_paths, days + 1))
+    paths[:, 0] = value = np.full(n_paths, float(current_price))
+    for i in range(days):
+        value = value + (fair_value - value) * reversion + shocks[i]
+        over = value > cap
+        value[over] = cap + (value[over] - cap) * damping
+        paths[:, i + 1] = value
+    return paths
+
+
+@pytest.mark.parametrize("current_price, fair_value", [
+    (1400.0, 1420.0),     # 저항선에 닿지 않음 - 닫힌 해만 사용
+    (1470.0, 1480.0),     # 일부 경로만 1500 을 넘음 - 닫힌 해와 순차 재계산이 섞임
+    (1490.0, 1530.0),     # 모든 경로가 1500 을 넘음
+])
+def test_simulate_paths_matches_daily_loop(current_price, fair_value):
+    paths = simulate_paths(current_price, fair_value, days=60, n_paths=500)
+    np.testing.assert_allclose(paths, reference_paths(current_price, fair_value, 60, 500), rtol=0, atol=1e-9)
+
+
+def test_simulate_paths_batch_matches_single_calls():
+    prices, fairs = [1480.0, 950.0, 1600.0], [1520.0, 990.0, 1580.0]
+    vols, caps = [3.5, 2.4, 4.0], [1500.0, 1000.0, 1750.0]
+    batch = simulate_paths(prices, fairs, days=30, n_paths=300, vol=vols, cap=caps)
+    assert batch.shape == (3, 300, 31)
+    for i in range(3):
+        single = simulate_paths(prices[i], fairs[i], days=30, n_paths=300, vol=vols[i], cap=caps[i])
+        np.testing.assert_allclose(batch[i], single, rtol=0, atol=1e-9)
+
+
+def test_forecast_bands_batch_matches_simulated_bands():
+    # 1400 대 적정가는 공통 노이즈 평행이동, 1495 는 저항선에 닿아 개별 시뮬레이션
+    fair_values = [1380.0, 1420.0, 1495.0]
+    bands = forecast_bands_batch(1450.0, fair_values, days=40, n_paths=400)
+    assert bands.shape == (3, len(FORECAST_PERCENTILES), 41)
+    for i, fair in enumerate(fair_values):
+        expected = forecast_bands(simulate_paths(1450.0, fair, days=40, n_paths=400))
+        np.testing.assert_allclose(bands[i], np.array([expected[p] for p in FORECAST_PERCENTILES]),
+                                   rtol=0, atol=1e-9)